@@ -11,7 +11,15 @@
 # - request: Access incoming request data (JSON, form data, files)
 # - jsonify: Convert Python dicts to JSON responses
 # - session: Server-side session management for user authentication
-from flask import Flask, request, jsonify, session
+# - g: Per-request storage (holds the verified access token payload)
+from flask import Flask, request, jsonify, session, g
+
+# Flask's JSON provider interface, used to plug in a faster JSON library
+# (the default provider supplies the fallback for non-JSON types)
+from flask.json.provider import JSONProvider, DefaultJSONProvider
+
+# Flask's request class, extended to control where uploaded files are buffered
+from flask import Request
 
 # Flask-CORS: Enable Cross-Origin Resource Sharing
 # Required for frontend (React/Vue/etc.) to communicate with this backend
@@ -25,14 +33,33 @@ from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 
+# functools: lru_cache for values computed once on first use,
+# wraps for the login_required decorator
+from functools import lru_cache, wraps
+
 # Standard library imports
 import os                   # File system operations (paths, directories)
-from datetime import datetime, timedelta  # Timestamps for unique filenames and JWT expiration
-import uuid                 # Generate unique identifiers
+import re                   # Precompiled validation patterns
+from datetime import datetime  # Timestamps for health checks
+import secrets              # Random tokens for unique upload filenames
+import logging              # Level-gated application logging
+import logging.handlers     # QueueHandler/QueueListener for background log output
+import queue                # Buffer between request threads and the log writer
+import atexit               # Flush queued log records at interpreter exit
+import threading            # Background thread for deleting uploaded files
+import tempfile             # Spooled temporary files for streamed uploads
+import time                 # Epoch timestamps for JWT claims
+import hashlib              # Compact cache keys for verified tokens and ETags
+import hmac                 # HMAC-SHA256 signatures for access tokens
+import base64               # base64url encoding of access token segments
+import json                 # Decoding with object hooks (tagged session values)
 
 # JWT for access token authentication
 import jwt
 
+# orjson: Fast JSON serialization written in Rust (used for all API responses)
+import orjson
+
 # =============================================================================
 # IMPORT LOCAL MODULES
 # =============================================================================
@@ -43,28 +70,36 @@ from database import (
     create_user,
     get_user_by_username,
     get_user_by_email,
-    get_user_by_id,
+    get_cached_user_by_id,
+    prime_user_cache,
+    update_user_password_hash,
     save_document,
-    get_user_documents,
+    get_user_documents_summary,
     get_document_by_id,
-    delete_document,
-    get_dashboard_stats,
-    user_exists
+    get_cached_dashboard_stats,
+    check_user_conflicts,
+    get_analysis_by_content_hash,
+    delete_document_returning_path,
+    get_document_owner
 )
 
+# In-memory TTL cache (verified access tokens)
+from cache import TTLCache
+
 # PDF text extraction
 from pdf_processor import (
-    extract_text_from_pdf,
     get_pdf_info
 )
 
 # Contract clause extraction
 from clause_extractor import (
-    extract_clauses,
     get_clause_summary,
     get_available_categories
 )
 
+# Upload analysis pipeline (text + clause extraction, optionally in worker processes)
+from document_analysis import analyze_document
+
 
 # =============================================================================
 # APPLICATION CONFIGURATION
@@ -74,6 +109,106 @@ from clause_extractor import (
 # __name__ tells Flask where to look for resources (templates, static files)
 app = Flask(__name__)
 
+# Module logger
+# Messages below the configured level are discarded without being formatted,
+# and logging never blocks on a shared stdout the way print() does.
+# Set LOG_LEVEL=WARNING in production to silence per-request messages.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+logger = logging.getLogger(__name__)
+
+# Maximum number of log records waiting for the background writer
+# When the queue is full new records are dropped instead of blocking a request
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records rather than waiting on a full queue."""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def configure_logging():
+    """
+    Send log records through a queue to a background writer thread.
+    
+    Request handlers only put a record on a bounded queue; formatting and
+    the write to stderr happen on the QueueListener's thread, so a slow or
+    piped stderr never stalls a request. Does nothing if the root logger
+    already has handlers (e.g. configured by gunicorn or a test runner).
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+    ))
+    
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    
+    root.addHandler(_NonBlockingQueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
+
+
+# -----------------------------------------------------------------------------
+# JSON PROVIDER CONFIGURATION
+# -----------------------------------------------------------------------------
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson.
+    
+    Replaces Flask's default provider (built on the standard library json
+    module) so every jsonify() response and request.get_json() call uses
+    orjson. orjson serializes several times faster and produces bytes
+    directly, which are passed to the response without an extra encode.
+    
+    The session cookie serializer also goes through this provider: it
+    decodes with object_hook= to restore tagged values (tuples, bytes,
+    Markup), which orjson can't do, so calls with keyword arguments are
+    decoded by the standard library json module instead.
+    """
+    
+    # No extra options: every response uses string keys, and orjson's
+    # OPT_NON_STR_KEYS mode is slower. datetime values are serialized
+    # natively as ISO 8601 strings.
+    option = None
+    
+    # Types orjson doesn't know (Decimal, objects with __html__, ...) are
+    # converted the same way as by Flask's default provider
+    default = staticmethod(DefaultJSONProvider.default)
+    
+    def dumps(self, obj, **kwargs):
+        # orjson output is always compact, which is what the session
+        # serializer's separators=(',', ':') asks for
+        return orjson.dumps(
+            obj, default=kwargs.get('default', self.default), option=self.option
+        ).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype='application/json'
+        )
+
+
+app.json = OrjsonProvider(app)
+
 # -----------------------------------------------------------------------------
 # SECRET KEY CONFIGURATION
 # -----------------------------------------------------------------------------
@@ -91,9 +226,12 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-i
 # -----------------------------------------------------------------------------
 # FILE UPLOAD CONFIGURATION
 # -----------------------------------------------------------------------------
+# Directory containing this script, resolved once at import
+# All application paths are built from it
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Define where uploaded PDF files will be stored
-# os.path.dirname(__file__) gets the directory containing this script
-UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
+UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
 # Maximum allowed file size: 10 MB (in bytes)
@@ -102,19 +240,87 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 # 10 MB = 10 * 1024 * 1024 bytes = 10,485,760 bytes
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10 MB
 
+# Uploaded files larger than this are streamed to a temporary file on disk
+# while the request is parsed, instead of being held in memory.
+# Keeps worker memory flat when many large PDFs are uploaded at once.
+# Requests larger than MAX_CONTENT_LENGTH are rejected (413) by Werkzeug
+# from the Content-Length header, before the body is read.
+UPLOAD_SPOOL_SIZE = 256 * 1024  # 256 KB
+
+# Chunk size used when copying an uploaded file into the uploads folder
+# One 1 MB buffer per upload instead of Werkzeug's 16 KB means a 10 MB
+# PDF is written with ~10 read/write pairs instead of ~640.
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024  # 1 MB
+
+# Register/login bodies are a few small JSON fields, so they get a much
+# lower limit than uploads. Larger bodies are rejected (413) before any
+# JSON parsing happens.
+AUTH_MAX_CONTENT_LENGTH = 8 * 1024  # 8 KB
+AUTH_PATHS = frozenset(('/api/register', '/api/login'))
+
+
+class UploadRequest(Request):
+    """
+    Request class that spools uploaded files to disk past UPLOAD_SPOOL_SIZE.
+    
+    Werkzeug's default keeps up to 500 KB of every uploaded file in memory.
+    Also applies AUTH_MAX_CONTENT_LENGTH to the authentication endpoints.
+    """
+    
+    @property
+    def max_content_length(self):
+        # Werkzeug checks this against Content-Length (and the bytes
+        # actually read) before the body is parsed
+        if self.path in AUTH_PATHS:
+            return AUTH_MAX_CONTENT_LENGTH
+        return super().max_content_length
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE, mode='rb+')
+
+
+app.request_class = UploadRequest
+
+# Instance folder holds deployment-specific files (the SQLite database)
+INSTANCE_FOLDER = os.path.join(BASE_DIR, 'instance')
+
 # Allowed file extensions
 # We only accept PDF files for contract analysis
 # Stored as a set for O(1) lookup performance
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# The same extensions as dotted suffixes, for a single str.endswith() check
+_ALLOWED_SUFFIXES = tuple(f'.{ext}' for ext in ALLOWED_EXTENSIONS)
+
 # -----------------------------------------------------------------------------
 # SESSION CONFIGURATION
 # -----------------------------------------------------------------------------
 # Configure session behavior
-app.config['SESSION_TYPE'] = 'filesystem'  # Store sessions on disk
 app.config['SESSION_PERMANENT'] = False    # Session expires when browser closes
 app.config['SESSION_USE_SIGNER'] = True    # Sign session cookies for security
 
+# Server-side sessions are stored in Redis when REDIS_URL is set.
+# Redis keeps session reads/writes in memory over a pooled TCP connection,
+# so no disk I/O happens on the request path.
+# Without REDIS_URL, Flask's built-in signed cookie sessions are used.
+#
+# Example: REDIS_URL=redis://localhost:6379/0
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    import redis
+    from flask_session import Session
+
+    # Share a bounded pool of sockets between worker threads
+    redis_pool = redis.ConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=50,
+        socket_keepalive=True
+    )
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.Redis(connection_pool=redis_pool)
+    Session(app)
+
 # -----------------------------------------------------------------------------
 # CORS CONFIGURATION
 # -----------------------------------------------------------------------------
@@ -125,10 +331,19 @@ app.config['SESSION_USE_SIGNER'] = True    # Sign session cookies for security
 # Configuration options:
 # - supports_credentials=True: Allow cookies/sessions in cross-origin requests
 # - origins: Specify allowed origins (use specific domains in production)
+# - methods: The HTTP methods the API actually uses
+# - max_age: Browsers cache preflight (OPTIONS) results for this many seconds,
+#   so most API calls don't need an extra OPTIONS round-trip first
 #
 # SECURITY NOTE: In production, restrict origins to your frontend domain only
 # Example: origins=["https://yourdomain.com", "https://www.yourdomain.com"]
-CORS(app, supports_credentials=True, origins=["http://localhost:3000", "http://127.0.0.1:3000"])
+CORS(
+    app,
+    supports_credentials=True,
+    origins=["http://localhost:3000", "http://127.0.0.1:3000"],
+    methods=['GET', 'POST', 'DELETE', 'OPTIONS'],
+    max_age=86400  # 24 hours
+)
 
 
 # =============================================================================
@@ -159,21 +374,19 @@ def allowed_file(filename):
         allowed_file("document.docx") # Returns False
         allowed_file("malware.exe")   # Returns False
     """
-    # Check if filename contains a dot (has extension)
-    # and if the extension (after the last dot) is in allowed set
-    # The rsplit('.', 1) splits from the right, once, to get the extension
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # Check if the filename ends with an allowed extension (case-insensitive)
+    # str.endswith() accepts a tuple and checks every suffix in one C-level call
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
 
 
-def generate_unique_filename(original_filename):
+def generate_unique_filename(filename):
     """
     Generate a unique filename for storing uploaded files.
     
     This function creates a unique filename by combining:
-    - A UUID (Universally Unique Identifier)
-    - A timestamp
-    - The original file extension
+    - A random URL-safe token (128 bits from os.urandom - collisions are
+      practically impossible)
+    - The file extension, lowercased
     
     Why unique filenames?
     - Prevents filename collisions (two users upload "contract.pdf")
@@ -181,31 +394,220 @@ def generate_unique_filename(original_filename):
     - Adds security by obscuring original filenames
     - Makes files harder to guess/access without authorization
     
+    The upload time is not part of the name; it is stored in the
+    database (documents.upload_date) instead.
+    
     Args:
-        original_filename (str): The original name of the uploaded file
+        filename (str): The uploaded file's name, already accepted by
+            allowed_file(). Only its extension is used, and that is one of
+            ALLOWED_EXTENSIONS, so no secure_filename() pass is needed.
     
     Returns:
-        str: A unique filename in format: uuid_timestamp.extension
+        str: A unique filename in format: token.extension
     
     Example:
-        generate_unique_filename("my_contract.pdf")
-        # Returns: "a1b2c3d4-e5f6-7890-abcd-ef1234567890_20250206_143052.pdf"
+        generate_unique_filename("my_contract.PDF")
+        # Returns: "Xq3v9bN0kT2mLw8rJ5yZaA.pdf"
     """
-    # Extract the file extension from the original filename
-    # secure_filename sanitizes the filename first to prevent path traversal
-    secure_name = secure_filename(original_filename)
+    # allowed_file() guarantees the name ends with ".<allowed extension>"
+    extension = filename.rpartition('.')[2].lower()
+    
+    # Combine a random token (22 chars of base64url, no padding) with the extension
+    return f"{secrets.token_urlsafe(16)}.{extension}"
+
+
+def save_upload(file, file_path):
+    """
+    Write an uploaded file to disk and hash its contents in the same pass.
+    
+    The upload is copied from its spooled temporary file in
+    UPLOAD_COPY_BUFFER_SIZE chunks, so memory use stays flat however large
+    the file is and however many uploads run at once. The digest identifies
+    a user's re-uploads of an identical PDF, so their stored analysis can be
+    reused (see get_analysis_by_content_hash).
     
-    # Get the extension (e.g., "pdf")
-    extension = secure_name.rsplit('.', 1)[1].lower() if '.' in secure_name else 'pdf'
+    Args:
+        file (FileStorage): The uploaded file from request.files
+        file_path (str): Where to write the file
     
-    # Generate unique components
-    unique_id = str(uuid.uuid4())  # Random UUID
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')  # Current timestamp
+    Returns:
+        str: Hex BLAKE2b digest of the file contents
     
-    # Combine into unique filename
-    unique_filename = f"{unique_id}_{timestamp}.{extension}"
+    Raises:
+        OSError: If the file cannot be written
+    """
+    hasher = hashlib.blake2b(digest_size=32)
     
-    return unique_filename
+    with open(file_path, 'wb') as out:
+        while True:
+            chunk = file.stream.read(UPLOAD_COPY_BUFFER_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            out.write(chunk)
+    
+    return hasher.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# BACKGROUND FILE DELETION
+# -----------------------------------------------------------------------------
+# Removing a PDF from the uploads folder doesn't affect the API response, and
+# on network storage an unlink can take a long time. Deleted documents'
+# files are queued here and removed by a background thread instead.
+
+_file_delete_queue = queue.SimpleQueue()
+_file_delete_thread = None
+_file_delete_pid = None
+
+
+def _file_delete_worker():
+    """Remove queued files, one at a time, for the life of the process."""
+    while True:
+        file_path = _file_delete_queue.get()
+        try:
+            os.remove(file_path)
+            logger.info("✓ Deleted file: %s", file_path)
+        except FileNotFoundError:
+            logger.info("→ File not found on disk (may have been deleted): %s", file_path)
+        except OSError as e:
+            logger.warning("⚠ Could not delete file %s: %s", file_path, e)
+
+
+def delete_file_later(file_path):
+    """
+    Queue a file for removal by the background deletion thread.
+    
+    The thread is started on first use in each process (threads don't
+    survive the fork into gunicorn workers).
+    
+    Args:
+        file_path (str): Path of the file to remove
+    """
+    global _file_delete_thread, _file_delete_pid
+    
+    if _file_delete_thread is None or _file_delete_pid != os.getpid():
+        _file_delete_thread = threading.Thread(
+            target=_file_delete_worker,
+            name='file-delete',
+            daemon=True
+        )
+        _file_delete_thread.start()
+        _file_delete_pid = os.getpid()
+    
+    _file_delete_queue.put(file_path)
+
+
+# Password hashing method for new accounts (PASSWORD_HASH_METHOD env var)
+# - 'pbkdf2:sha256' (default): Werkzeug PBKDF2 with its default iteration
+#   count; use 'pbkdf2:sha256:<iterations>' to tune the cost
+# - 'scrypt': Werkzeug scrypt (memory-hard); 'scrypt:<n>:<r>:<p>' to tune
+# - 'argon2': Argon2id via argon2-cffi (memory-hard, optimized C implementation)
+# Hashes created with a different method keep working, and are replaced with
+# the configured method the next time the user logs in successfully.
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+
+# Argon2 parameters (used when PASSWORD_HASH_METHOD is 'argon2')
+ARGON2_TIME_COST = 2         # Iterations
+ARGON2_MEMORY_COST = 65536   # Memory in KiB (64 MB)
+ARGON2_PARALLELISM = 2       # Lanes
+
+# Every Argon2 hash string starts with this prefix ($argon2id$...)
+_ARGON2_PREFIX = '$argon2'
+
+
+@lru_cache(maxsize=1)
+def get_argon2_hasher():
+    """
+    Get the shared Argon2 password hasher.
+    
+    argon2-cffi is imported on first use, so it is only required when
+    Argon2 is configured or an Argon2 hash needs verifying.
+    
+    Returns:
+        argon2.PasswordHasher: Hasher using the ARGON2_* parameters
+    """
+    from argon2 import PasswordHasher
+    return PasswordHasher(
+        time_cost=ARGON2_TIME_COST,
+        memory_cost=ARGON2_MEMORY_COST,
+        parallelism=ARGON2_PARALLELISM
+    )
+
+
+def hash_password(password):
+    """
+    Hash a password with the configured PASSWORD_HASH_METHOD.
+    
+    Args:
+        password (str): The plain-text password
+    
+    Returns:
+        str: The password hash (includes method, parameters and salt)
+    """
+    if PASSWORD_HASH_METHOD == 'argon2':
+        return get_argon2_hasher().hash(password)
+    return generate_password_hash(password, method=PASSWORD_HASH_METHOD)
+
+
+def verify_password(stored_hash, password):
+    """
+    Check a password against a stored hash of any supported method.
+    
+    Args:
+        stored_hash (str): Hash from the database
+        password (str): The plain-text password to check
+    
+    Returns:
+        bool: True if the password matches, False otherwise
+    """
+    if stored_hash.startswith(_ARGON2_PREFIX):
+        from argon2.exceptions import VerificationError, InvalidHashError
+        try:
+            return get_argon2_hasher().verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    # check_password_hash uses constant-time comparison to prevent timing attacks
+    return check_password_hash(stored_hash, password)
+
+
+def password_needs_rehash(stored_hash):
+    """
+    Check whether a stored hash was made with other settings than the current ones.
+    
+    Args:
+        stored_hash (str): Hash from the database
+    
+    Returns:
+        bool: True if the password should be hashed again with hash_password()
+    """
+    if PASSWORD_HASH_METHOD == 'argon2':
+        if not stored_hash.startswith(_ARGON2_PREFIX):
+            return True
+        return get_argon2_hasher().check_needs_rehash(stored_hash)
+    
+    # Werkzeug hashes look like "method$salt$hash", where method includes the
+    # cost (e.g. "pbkdf2:sha256:600000"). Compare against a hash made now.
+    current_method = get_dummy_password_hash().split('$', 1)[0]
+    return stored_hash.split('$', 1)[0] != current_method
+
+
+@lru_cache(maxsize=1)
+def get_dummy_password_hash():
+    """
+    Get a password hash that no real password is checked against.
+    
+    Login verifies the password against this hash when the email is
+    unknown, so a failed login takes the same time whether or not the
+    account exists (otherwise the missing hash check would reveal which
+    emails are registered). Built on first use so importing the app
+    doesn't pay for a key derivation.
+    
+    Returns:
+        str: A hash created with PASSWORD_HASH_METHOD
+    """
+    return hash_password(secrets.token_hex(16))
 
 
 # =============================================================================
@@ -215,9 +617,51 @@ def generate_unique_filename(original_filename):
 # JWT token expiration time (24 hours)
 JWT_EXPIRATION_HOURS = 24
 
+# Token lifetime in seconds, added to the issue time (an integer epoch)
+_JWT_EXP_SECONDS = JWT_EXPIRATION_HOURS * 3600
+
 # JWT algorithm
 JWT_ALGORITHM = 'HS256'
 
+# Signing key as bytes, encoded once instead of on every encode/decode
+# HS256 is computed by hashlib/hmac, which use OpenSSL's SHA-256
+_JWT_KEY = app.config['SECRET_KEY'].encode('utf-8')
+
+# Accepted algorithms for jwt.decode, built once instead of per call
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+
+# Claims a token must carry to be accepted. A validly signed token without
+# them (e.g. minted by another tool sharing the key) is rejected as invalid
+# instead of failing later on a missing key.
+_JWT_DECODE_OPTIONS = {'require': ['exp', 'user_id']}
+
+def _base64url(data):
+    """Encode bytes as unpadded base64url, as used in JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# The JWT header is the same for every token, so its encoded segment is
+# built once. generate_access_token() signs with HMAC-SHA256 to match.
+_JWT_HEADER_SEGMENT = _base64url(orjson.dumps({'alg': JWT_ALGORITHM, 'typ': 'JWT'}))
+
+# Authorization header scheme for access tokens: "Bearer <token>"
+_BEARER_PREFIX = 'Bearer '
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
+
+# Verified token cache
+# Clients send the same token on many requests in a row, so the decoded
+# payload is remembered for a short time and repeat requests skip the
+# HMAC check and JSON decoding.
+# - JWT_CACHE_TTL: Seconds a verified token stays cached
+# - JWT_CACHE_MAXSIZE: Maximum number of cached tokens
+# - JWT_CACHE_EXP_MARGIN: Tokens this close to expiry (seconds) are not served from cache
+JWT_CACHE_TTL = 60
+JWT_CACHE_MAXSIZE = 10000
+JWT_CACHE_EXP_MARGIN = 5
+
+# Maps token digest -> decoded payload
+_token_cache = TTLCache(maxsize=JWT_CACHE_MAXSIZE, ttl=JWT_CACHE_TTL)
+
 
 def generate_access_token(user_id, username, role):
     """
@@ -225,6 +669,11 @@ def generate_access_token(user_id, username, role):
     
     The token contains user information and has an expiration time.
     
+    Every token has the same header and key, so the token is assembled
+    directly: the precomputed header segment, the base64url-encoded
+    payload, and an HMAC-SHA256 signature over both. The result is a
+    standard HS256 JWT, verified by PyJWT in verify_access_token().
+    
     Args:
         user_id (int): The user's database ID
         username (str): The user's username
@@ -233,54 +682,101 @@ def generate_access_token(user_id, username, role):
     Returns:
         str: The encoded JWT token
     """
+    # JWT timestamps are integer seconds since the epoch
+    now = int(time.time())
+    
     payload = {
         'user_id': user_id,
         'username': username,
         'role': role,
-        'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
-        'iat': datetime.utcnow()  # Issued at time
+        'exp': now + _JWT_EXP_SECONDS,
+        'iat': now  # Issued at time
     }
     
-    token = jwt.encode(
-        payload,
-        app.config['SECRET_KEY'],
-        algorithm=JWT_ALGORITHM
-    )
+    # header.payload is the signed part of the token
+    signing_input = _JWT_HEADER_SEGMENT + b'.' + _base64url(orjson.dumps(payload))
+    signature = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
     
-    return token
+    return (signing_input + b'.' + _base64url(signature)).decode('ascii')
 
 
 def verify_access_token(token):
     """
     Verify and decode a JWT access token.
     
+    Successfully verified tokens are cached (keyed by a BLAKE2b digest of
+    the token) for up to JWT_CACHE_TTL seconds, and never past their own
+    expiry, so repeat requests with the same token skip verification.
+    
     Args:
         token (str): The JWT token to verify
     
     Returns:
         dict: The decoded payload if valid, None otherwise
     """
+    cache_key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+    
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(
             token,
-            app.config['SECRET_KEY'],
-            algorithms=[JWT_ALGORITHM]
+            _JWT_KEY,
+            algorithms=_JWT_ALGORITHMS,
+            options=_JWT_DECODE_OPTIONS
         )
-        return payload
     except jwt.ExpiredSignatureError:
-        print("✗ Token expired")
+        logger.debug("✗ Token expired")
         return None
     except jwt.InvalidTokenError as e:
-        print(f"✗ Invalid token: {e}")
+        logger.debug("✗ Invalid token: %s", e)
         return None
+    
+    # Cache until the TTL ends or shortly before the token expires
+    ttl = min(JWT_CACHE_TTL, payload['exp'] - JWT_CACHE_EXP_MARGIN - time.time())
+    if ttl > 0:
+        _token_cache.set(cache_key, payload, ttl=ttl)
+    
+    return dict(payload)
+
+
+@app.before_request
+def authenticate_request():
+    """
+    Resolve the authenticated user once per request.
+    
+    Runs before every request and stores the user's ID in g.user_id
+    (None when not authenticated). Authentication is checked in order:
+    1. JWT access token in the Authorization header (Bearer token)
+    2. Session cookie (user_id in session)
+    
+    login_required, get_current_user and get_current_user_id read
+    g.user_id instead of parsing and verifying the token again.
+    """
+    g.user_id = None
+    
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header.startswith(_BEARER_PREFIX):
+        # Slice off the fixed-length prefix instead of splitting into a list
+        token = auth_header[_BEARER_PREFIX_LEN:]
+        payload = verify_access_token(token)
+        if payload:
+            g.user_id = payload['user_id']
+            return
+    
+    # Fall back to session-based authentication
+    g.user_id = session.get('user_id')
 
 
 def get_current_user():
     """
     Get the currently logged-in user from the session or access token.
     
-    This helper function first checks for an access token in the Authorization header,
-    then falls back to checking the session cookie.
+    Uses the user ID resolved by authenticate_request() and loads the
+    user record through the short-lived user cache. The record is kept on
+    flask.g, so repeated calls within a request don't look it up again.
     
     Returns:
         dict: User data if logged in, None otherwise
@@ -290,38 +786,27 @@ def get_current_user():
         if not user:
             return jsonify({'error': 'Not authenticated'}), 401
     """
-    # First, try to get user from access token (Authorization header)
-    auth_header = request.headers.get('Authorization')
-    if auth_header and auth_header.startswith('Bearer '):
-        token = auth_header.split(' ', 1)[1]
-        payload = verify_access_token(token)
-        if payload:
-            return get_user_by_id(payload['user_id'])
+    # Loaded at most once per request; later calls reuse the result on g
+    if 'current_user' in g:
+        return g.current_user
     
-    # Fall back to session-based authentication
-    user_id = session.get('user_id')
-    if not user_id:
-        return None
-    return get_user_by_id(user_id)
+    user_id = get_current_user_id()
+    user = get_cached_user_by_id(user_id) if user_id else None
+    g.current_user = user
+    return user
 
 
 def get_current_user_id():
     """
     Get the current user's ID from session or access token.
     
+    Authentication was already resolved by authenticate_request(),
+    so this is a lookup on flask.g and never touches the database.
+    
     Returns:
         int: User ID if authenticated, None otherwise
     """
-    # First, try to get user_id from access token (Authorization header)
-    auth_header = request.headers.get('Authorization')
-    if auth_header and auth_header.startswith('Bearer '):
-        token = auth_header.split(' ', 1)[1]
-        payload = verify_access_token(token)
-        if payload:
-            return payload['user_id']
-    
-    # Fall back to session-based authentication
-    return session.get('user_id')
+    return g.get('user_id')
 
 
 def login_required(f):
@@ -340,21 +825,10 @@ def login_required(f):
         def protected_route():
             return jsonify({'message': 'You are logged in!'})
     """
-    from functools import wraps
-    
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Try access token first
-        auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ', 1)[1]
-            payload = verify_access_token(token)
-            if payload:
-                # Token is valid, allow access
-                return f(*args, **kwargs)
-        
-        # Fall back to session-based authentication
-        if 'user_id' in session:
+        # Token or session was resolved by authenticate_request()
+        if g.get('user_id'):
             return f(*args, **kwargs)
         
         # Neither token nor session is valid
@@ -376,33 +850,59 @@ def ensure_directories():
     
     This function ensures that the uploads folder and instance folder
     (for SQLite database) exist before the application starts.
+    exist_ok=True makes each call a single syscall that is safe to repeat.
     """
     # Create uploads directory
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
-        print(f"✓ Created uploads directory: {UPLOAD_FOLDER}")
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
     
     # Create instance directory (for SQLite database)
-    instance_folder = os.path.join(os.path.dirname(__file__), 'instance')
-    if not os.path.exists(instance_folder):
-        os.makedirs(instance_folder)
-        print(f"✓ Created instance directory: {instance_folder}")
+    os.makedirs(INSTANCE_FOLDER, exist_ok=True)
 
 
 # =============================================================================
 # APPLICATION INITIALIZATION
 # =============================================================================
 
-# Ensure directories exist
-ensure_directories()
+# Set once create_app() has prepared directories and the database
+_initialized = False
 
-# Initialize the database (create tables if they don't exist)
-# This is called when the module is imported or when the app starts
-print("\n" + "=" * 50)
-print("ContractIQ Backend Starting...")
-print("=" * 50)
-init_db()
-print("=" * 50 + "\n")
+
+def create_app():
+    """
+    Application factory - prepare the app for serving and return it.
+    
+    Importing this module only defines the app and its routes. The one-time
+    startup work (creating directories, creating database tables) happens
+    here instead, so imports stay cheap for tests and tooling. The work runs
+    once per process; later calls just return the app.
+    
+    Returns:
+        Flask: The initialized application
+    
+    Usage:
+        gunicorn wsgi:app                      # wsgi.py calls create_app()
+        flask --app "app:create_app()" run     # Flask CLI
+    """
+    global _initialized
+    
+    if not _initialized:
+        # Send log records to stderr at LOG_LEVEL via a background thread
+        # (no-op if logging is already configured, e.g. by a test runner)
+        configure_logging()
+        logger.info("ContractIQ Backend Starting...")
+        
+        # Ensure directories exist
+        ensure_directories()
+        
+        # Initialize the database (create tables if they don't exist)
+        # This is safe to call multiple times (uses IF NOT EXISTS), and only
+        # checks the schema version when the database is already current
+        init_db()
+        logger.info("✓ ContractIQ Backend ready")
+        
+        _initialized = True
+    
+    return app
 
 
 # =============================================================================
@@ -414,6 +914,43 @@ print("=" * 50 + "\n")
 # - Analysis routes (extract clauses, get summary)
 # - Dashboard routes (stats, recent documents)
 
+# Static API information returned by the root endpoint
+API_INFO = {
+    'name': 'ContractIQ API',
+    'version': '1.0.0',
+    'status': 'running',
+    'message': 'Welcome to ContractIQ - Contract Analysis API',
+    'endpoints': {
+        'health': 'GET /',
+        'auth': {
+            'register': 'POST /api/auth/register',
+            'login': 'POST /api/auth/login',
+            'logout': 'POST /api/auth/logout',
+            'profile': 'GET /api/auth/profile'
+        },
+        'documents': {
+            'upload': 'POST /api/documents/upload',
+            'list': 'GET /api/documents',
+            'get': 'GET /api/documents/<id>',
+            'delete': 'DELETE /api/documents/<id>'
+        },
+        'dashboard': 'GET /api/dashboard'
+    }
+}
+
+# API_INFO never changes while the process runs, so the response body and
+# its ETag are computed once. Each request just writes the prepared bytes.
+# Clients and proxies that send the ETag back in If-None-Match get an empty 304.
+_INDEX_BODY = orjson.dumps(API_INFO)
+_INDEX_ETAG = hashlib.blake2b(_INDEX_BODY, digest_size=16).hexdigest()
+
+# Cache-Control headers
+# - index: Static content, cacheable by browsers and proxies
+# - health: Short lifetime so probes still notice an unhealthy instance quickly
+INDEX_CACHE_CONTROL = 'public, max-age=30'
+HEALTH_CACHE_CONTROL = 'public, max-age=10'
+
+
 @app.route('/')
 def index():
     """
@@ -421,29 +958,19 @@ def index():
     
     Returns basic information about the API and its status.
     Useful for monitoring and debugging.
+    
+    The response carries an ETag and a Cache-Control header. A request
+    whose If-None-Match matches the ETag gets 304 Not Modified without
+    a body.
     """
-    return jsonify({
-        'name': 'ContractIQ API',
-        'version': '1.0.0',
-        'status': 'running',
-        'message': 'Welcome to ContractIQ - Contract Analysis API',
-        'endpoints': {
-            'health': 'GET /',
-            'auth': {
-                'register': 'POST /api/auth/register',
-                'login': 'POST /api/auth/login',
-                'logout': 'POST /api/auth/logout',
-                'profile': 'GET /api/auth/profile'
-            },
-            'documents': {
-                'upload': 'POST /api/documents/upload',
-                'list': 'GET /api/documents',
-                'get': 'GET /api/documents/<id>',
-                'delete': 'DELETE /api/documents/<id>'
-            },
-            'dashboard': 'GET /api/dashboard'
-        }
-    })
+    if _INDEX_ETAG in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(_INDEX_BODY, mimetype='application/json')
+    
+    response.set_etag(_INDEX_ETAG)
+    response.headers['Cache-Control'] = INDEX_CACHE_CONTROL
+    return response
 
 
 @app.route('/health')
@@ -453,17 +980,67 @@ def health_check():
     
     Returns a simple status indicating the API is running.
     Used by load balancers, monitoring tools, and container orchestration.
+    The response may be cached for a few seconds (HEALTH_CACHE_CONTROL).
     """
-    return jsonify({
+    response = jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat()
     })
+    response.headers['Cache-Control'] = HEALTH_CACHE_CONTROL
+    return response
 
 
 # =============================================================================
 # AUTHENTICATION ROUTES
 # =============================================================================
 
+# Registration field patterns, compiled once at import
+# - Username: 3-50 word characters (letters, numbers, underscore)
+# - Email: one @, no whitespace, and a dot in the domain part
+USERNAME_PATTERN = re.compile(r'\A\w{3,50}\Z')
+EMAIL_PATTERN = re.compile(r'\A[^@\s]+@[^@\s]+\.[^@\s]+\Z')
+
+# Roles a user may register with
+ALLOWED_ROLES = ('admin', 'lawyer', 'client')
+_ALLOWED_ROLES_SET = frozenset(ALLOWED_ROLES)
+
+# Longest accepted password - hashing cost grows with input length
+PASSWORD_MAX_LENGTH = 1024
+
+
+def get_json_strings(data, defaults):
+    """
+    Read string fields from a parsed JSON request body in one pass.
+    
+    Checks the body's structure up front so the route's field checks can
+    assume strings, instead of failing with a 500 on bodies like [] or
+    {"email": 5}.
+    
+    Args:
+        data: Parsed JSON body
+        defaults (dict): Field name -> value used when the field is missing
+    
+    Returns:
+        tuple: Field values in the order of defaults
+        None: If the body isn't an object or a field isn't a string
+    
+    Example:
+        fields = get_json_strings(data, {'email': '', 'password': ''})
+        if fields is None:
+            return error_response
+        email, password = fields
+    """
+    if not isinstance(data, dict):
+        return None
+    
+    values = tuple(data.get(name, default) for name, default in defaults.items())
+    for value in values:
+        if type(value) is not str:
+            return None
+    
+    return values
+
+
 @app.route('/api/register', methods=['POST'])
 def register():
     """
@@ -514,11 +1091,23 @@ def register():
     # Get JSON data from request body
     data = request.get_json()
     
-    # Extract fields from request
-    username = data.get('username', '').strip()
-    email = data.get('email', '').strip().lower()  # Normalize email to lowercase
-    password = data.get('password', '')
-    role = data.get('role', 'client').strip().lower()  # Default role is 'client'
+    # Extract fields from request (all must be strings)
+    fields = get_json_strings(data, {
+        'username': '',
+        'email': '',
+        'password': '',
+        'role': 'client'  # Default role is 'client'
+    })
+    if fields is None:
+        return jsonify({
+            'success': False,
+            'error': 'Request body must be a JSON object with string fields'
+        }), 400
+    
+    username, email, password, role = fields
+    username = username.strip()
+    email = email.strip().lower()  # Normalize email to lowercase
+    role = role.strip().lower()
     
     # -------------------------------------------------------------------------
     # Step 2: Validate required fields
@@ -547,52 +1136,62 @@ def register():
     # Step 3: Validate field formats and constraints
     # -------------------------------------------------------------------------
     
-    # Username validation: 3-50 characters, alphanumeric and underscores only
-    if len(username) < 3 or len(username) > 50:
-        return jsonify({
-            'success': False,
-            'error': 'Username must be between 3 and 50 characters'
-        }), 400
-    
-    if not username.replace('_', '').isalnum():
+    # Username validation: 3-50 characters, letters, numbers and underscores only
+    # One precompiled regex checks length and characters in a single scan;
+    # the length is only measured again to pick the error message
+    if not USERNAME_PATTERN.match(username):
+        if len(username) < 3 or len(username) > 50:
+            return jsonify({
+                'success': False,
+                'error': 'Username must be between 3 and 50 characters'
+            }), 400
+        
         return jsonify({
             'success': False,
             'error': 'Username can only contain letters, numbers, and underscores'
         }), 400
     
-    # Email validation: Basic format check (contains @ and .)
-    if '@' not in email or '.' not in email.split('@')[-1]:
+    # Email validation: Basic format check (something@domain.tld, no spaces)
+    if not EMAIL_PATTERN.match(email):
         return jsonify({
             'success': False,
             'error': 'Please provide a valid email address'
         }), 400
     
-    # Password validation: Minimum 6 characters
+    # Password validation: 6 to PASSWORD_MAX_LENGTH characters
     if len(password) < 6:
         return jsonify({
             'success': False,
             'error': 'Password must be at least 6 characters long'
         }), 400
     
+    if len(password) > PASSWORD_MAX_LENGTH:
+        return jsonify({
+            'success': False,
+            'error': f'Password must be at most {PASSWORD_MAX_LENGTH} characters long'
+        }), 400
+    
     # Role validation: Must be one of the allowed values
-    allowed_roles = ['admin', 'lawyer', 'client']
-    if role not in allowed_roles:
+    if role not in _ALLOWED_ROLES_SET:
         return jsonify({
             'success': False,
-            'error': f'Invalid role. Must be one of: {", ".join(allowed_roles)}'
+            'error': f'Invalid role. Must be one of: {", ".join(ALLOWED_ROLES)}'
         }), 400
     
     # -------------------------------------------------------------------------
     # Step 4: Check if username or email already exists
     # -------------------------------------------------------------------------
     
-    if user_exists(username=username):
+    # A single query tells us which of the two is already taken
+    username_taken, email_taken = check_user_conflicts(username, email)
+    
+    if username_taken:
         return jsonify({
             'success': False,
             'error': 'Username already exists. Please choose a different username.'
         }), 409  # 409 Conflict
     
-    if user_exists(email=email):
+    if email_taken:
         return jsonify({
             'success': False,
             'error': 'Email already registered. Please use a different email or login.'
@@ -602,10 +1201,10 @@ def register():
     # Step 5: Hash password and create user
     # -------------------------------------------------------------------------
     
-    # Generate secure password hash
-    # The method 'pbkdf2:sha256' is secure and widely recommended
+    # Generate secure password hash with the configured PASSWORD_HASH_METHOD
+    # (PBKDF2-SHA256 by default, which is secure and widely recommended)
     # The hash includes the salt, so we don't need to store it separately
-    password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+    password_hash = hash_password(password)
     
     # Create the user in the database
     user_id = create_user(
@@ -625,7 +1224,7 @@ def register():
     # Step 6: Return success response
     # -------------------------------------------------------------------------
     
-    print(f"✓ New user registered: {username} (ID: {user_id}, Role: {role})")
+    logger.info("✓ New user registered: %s (ID: %s, Role: %s)", username, user_id, role)
     
     return jsonify({
         'success': True,
@@ -686,6 +1285,7 @@ def login():
     Security Notes:
         - Failed login attempts don't reveal whether email exists
         - Same error message for wrong email and wrong password
+        - Unknown emails are checked against a dummy hash, so both failures take the same time
         - Password comparison uses constant-time comparison (via check_password_hash)
     """
     
@@ -704,8 +1304,15 @@ def login():
     data = request.get_json()
     
     # Extract credentials - now using email instead of username
-    email = data.get('email', '').strip().lower()  # Normalize email to lowercase
-    password = data.get('password', '')
+    fields = get_json_strings(data, {'email': '', 'password': ''})
+    if fields is None:
+        return jsonify({
+            'success': False,
+            'error': 'Request body must be a JSON object with string fields'
+        }), 400
+    
+    email, password = fields
+    email = email.strip().lower()  # Normalize email to lowercase
     
     # Validate that both fields are provided
     if not email or not password:
@@ -727,39 +1334,61 @@ def login():
     # Check if user exists and password is correct
     # IMPORTANT: We use the same error message for both cases to prevent
     # email enumeration attacks (attacker can't tell if email exists)
+    #
+    # The password hash check also runs for unknown emails (against a dummy
+    # hash), so both failures take the same time and response timing doesn't
+    # reveal whether the email exists.
+    # verify_password uses constant-time comparison to prevent timing attacks
+    stored_hash = user['password_hash'] if user else get_dummy_password_hash()
+    password_ok = verify_password(stored_hash, password)
+    
     if not user:
         # User doesn't exist - but don't reveal this
-        print(f"✗ Login failed: Email not found - {email}")
+        logger.info("✗ Login failed: Email not found - %s", email)
         return jsonify({
             'success': False,
             'error': 'Invalid email or password'
         }), 401
     
-    # Verify password against stored hash
-    # check_password_hash uses constant-time comparison to prevent timing attacks
-    if not check_password_hash(user['password_hash'], password):
+    if not password_ok:
         # Password doesn't match
-        print(f"✗ Login failed: Wrong password for email - {email}")
+        logger.info("✗ Login failed: Wrong password for email - %s", email)
         return jsonify({
             'success': False,
             'error': 'Invalid email or password'
         }), 401
     
+    # Upgrade hashes made with older settings (e.g. after switching
+    # PASSWORD_HASH_METHOD) while we have the plain-text password
+    if password_needs_rehash(user['password_hash']):
+        update_user_password_hash(user['id'], hash_password(password))
+    
+    # The client's next request looks this user up by ID - cache the row we
+    # already have so that lookup doesn't hit the database
+    prime_user_cache(user)
+    
     # -------------------------------------------------------------------------
     # Step 4: Create session (for cookie-based auth)
     # -------------------------------------------------------------------------
     
-    # Clear any existing session data
-    session.clear()
-    
-    # Store user information in session
-    # This creates a signed cookie that the client will send with future requests
-    session['user_id'] = user['id']
-    session['username'] = user['username']
-    session['role'] = user['role']
+    # API clients that send a bearer token and no session cookie only use
+    # the access token, so skip building (and signing) a session cookie
+    token_only_client = (
+        request.headers.get('Authorization')
+        and app.config['SESSION_COOKIE_NAME'] not in request.cookies
+    )
     
-    # Mark session as modified to ensure it's saved
-    session.modified = True
+    if not token_only_client:
+        # Clear any existing session data (nothing to clear for new clients)
+        if session:
+            session.clear()
+        
+        # Store user information in session
+        # This creates a signed cookie that the client will send with future requests
+        # (assigning keys marks the session as modified so it gets saved)
+        session['user_id'] = user['id']
+        session['username'] = user['username']
+        session['role'] = user['role']
     
     # -------------------------------------------------------------------------
     # Step 5: Generate JWT access token
@@ -775,7 +1404,8 @@ def login():
     # Step 6: Return success response with access token
     # -------------------------------------------------------------------------
     
-    print(f"✓ User logged in: {user['username']} (ID: {user['id']}) via email: {email}")
+    logger.info("✓ User logged in: %s (ID: %s) via email: %s",
+                user['username'], user['id'], email)
     
     return jsonify({
         'success': True,
@@ -821,7 +1451,7 @@ def logout():
     # This removes user_id, username, role, and any other session variables
     session.clear()
     
-    print(f"✓ User logged out: {username}")
+    logger.info("✓ User logged out: %s", username)
     
     return jsonify({
         'success': True,
@@ -964,13 +1594,13 @@ def dashboard():
     # Step 2: Fetch user information from database
     # -------------------------------------------------------------------------
     #
-    # Even though we have user_id in the session, we fetch fresh user data
-    # from the database. This ensures:
+    # Even though we have user_id in the session, we fetch user data
+    # from the database (through a short-lived cache). This ensures:
     # - User still exists (wasn't deleted)
-    # - We have the latest user information (role might have changed)
+    # - We have recent user information (at most USER_CACHE_TTL seconds old)
     # - We don't expose sensitive data stored only in session
     
-    user = get_user_by_id(user_id)
+    user = get_cached_user_by_id(user_id)
     
     # Handle case where user was deleted after login
     if not user:
@@ -987,14 +1617,16 @@ def dashboard():
     #
     # Fetch aggregated statistics about the user's documents.
     # This provides a quick overview without loading all document data.
+    # Stats are cached for a few seconds per user and refreshed as soon as
+    # the user uploads or deletes a document.
     
-    stats = get_dashboard_stats(user_id)
+    stats = get_cached_dashboard_stats(user_id)
     
     # -------------------------------------------------------------------------
     # Step 4: Return dashboard data
     # -------------------------------------------------------------------------
     
-    print(f"→ Dashboard accessed by: {user['username']} (ID: {user_id})")
+    logger.info("→ Dashboard accessed by: %s (ID: %s)", user['username'], user_id)
     
     return jsonify({
         'success': True,
@@ -1046,7 +1678,7 @@ def upload_document():
                 "message": "Document uploaded and processed successfully",
                 "document": {
                     "id": 1,
-                    "filename": "uuid_timestamp.pdf",
+                    "filename": "random_token.pdf",
                     "original_filename": "contract.pdf",
                     "upload_date": "2025-02-06 10:30:00",
                     "clauses": {
@@ -1109,6 +1741,11 @@ def upload_document():
     # -------------------------------------------------------------------------
     # For file uploads, the file comes in request.files, not request.json
     # The key 'file' is the field name expected from the client form
+    # 
+    # Accessing request.files is also where oversized uploads are rejected:
+    # Werkzeug compares Content-Length with MAX_CONTENT_LENGTH and raises 413
+    # before reading any of the body, and bodies without a Content-Length
+    # are cut off once they pass the limit.
     
     # Check if the 'file' key exists in the request
     if 'file' not in request.files:
@@ -1151,20 +1788,19 @@ def upload_document():
     # Store the original filename for display purposes
     original_filename = secure_filename(file.filename)
     
-    # Generate a unique filename using UUID and timestamp
-    unique_filename = generate_unique_filename(original_filename)
+    # Generate a unique filename from a random token and the extension
+    unique_filename = generate_unique_filename(file.filename)
     
     # Create the full file path in the uploads directory
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+    file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
     
     try:
-        # Save the uploaded file to disk
-        # Flask's FileStorage.save() handles the file writing
-        file.save(file_path)
-        print(f"✓ File saved: {file_path}")
+        # Save the uploaded file to disk, hashing it on the way
+        content_hash = save_upload(file, file_path)
+        logger.info("✓ File saved: %s", file_path)
         
     except Exception as e:
-        print(f"✗ Error saving file: {e}")
+        logger.error("✗ Error saving file: %s", e)
         return jsonify({
             'success': False,
             'error': 'Failed to save the uploaded file. Please try again.'
@@ -1173,12 +1809,20 @@ def upload_document():
     # -------------------------------------------------------------------------
     # Step 5: Extract text from PDF
     # -------------------------------------------------------------------------
-    # Use our pdf_processor module to extract text content from the PDF
-    # This uses PyPDF2 to read the PDF and extract all text
+    # Use our document_analysis module to extract the text content and the
+    # clauses in one call (in a worker process if PDF_PROCESS_WORKERS is set).
+    # The PDF is read from the saved file, never held in memory as a whole
+    # by the request. If the user uploaded an identical file before, reuse
+    # its stored results.
     
-    print(f"→ Extracting text from: {original_filename}")
+    cached_analysis = get_analysis_by_content_hash(user_id, content_hash)
     
-    extracted_text = extract_text_from_pdf(file_path)
+    if cached_analysis is not None:
+        logger.info("→ Reusing analysis of an identical earlier upload: %s", original_filename)
+        extracted_text, clauses = cached_analysis
+    else:
+        logger.info("→ Extracting text from: %s", original_filename)
+        extracted_text, clauses = analyze_document(file_path)
     
     # Check if text extraction was successful
     if extracted_text is None:
@@ -1189,30 +1833,21 @@ def upload_document():
         # - Empty PDF
         
         # We still save the document but with a warning
-        print(f"⚠ Could not extract text from: {original_filename}")
+        logger.warning("⚠ Could not extract text from: %s", original_filename)
         extracted_text = ""  # Store empty string instead of None
         extraction_warning = "Could not extract text from this PDF. It may be scanned, encrypted, or empty."
     else:
         extraction_warning = None
-        print(f"✓ Extracted {len(extracted_text)} characters")
+        logger.info("✓ Extracted %d characters", len(extracted_text))
     
     # -------------------------------------------------------------------------
     # Step 6: Extract clauses from text
     # -------------------------------------------------------------------------
-    # Use our clause_extractor module to identify and categorize clauses
-    # This uses keyword matching to find relevant contract terms
+    # Clauses were identified by analyze_document() with keyword matching
     
-    print(f"→ Analyzing document for clauses...")
+    logger.info("→ Analyzing document for clauses...")
     
-    if extracted_text:
-        # Extract clauses using keyword matching
-        clauses = extract_clauses(extracted_text)
-        
-        # Create a summary for the response
-        clauses_summary = create_clauses_summary(clauses)
-        
-        print(f"✓ Found {clauses_summary['total_clauses']} clauses across {len(clauses_summary['categories'])} categories")
-    else:
+    if clauses is None:
         # No text to analyze
         clauses = {
             "Termination": [],
@@ -1221,7 +1856,13 @@ def upload_document():
             "Confidentiality": [],
             "Intellectual Property": []
         }
-        clauses_summary = {'total_clauses': 0, 'categories': {}}
+    
+    # Create the summary once: the same object is stored with the document
+    # (so the document list doesn't recount clauses) and returned below
+    clauses_summary = create_clauses_summary(clauses)
+    
+    logger.info("✓ Found %d clauses across %d categories",
+                clauses_summary['total_clauses'], len(clauses_summary['categories']))
     
     # -------------------------------------------------------------------------
     # Step 7: Save document to database
@@ -1231,15 +1872,23 @@ def upload_document():
     # - File information (names, path)
     # - Extracted content (text and clauses)
     
-    print(f"→ Saving to database...")
+    logger.info("→ Saving to database...")
+    
+    # Create text preview (first 500 characters) - stored with the document
+    # so the detail endpoint can return it without loading the full text
+    text_preview = extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text
     
-    document_id = save_document(
+    document_id, upload_date = save_document(
         user_id=user_id,
         filename=unique_filename,
         original_filename=original_filename,
         file_path=file_path,
         extracted_text=extracted_text,
-        clauses=clauses  # This will be JSON-serialized by the database module
+        clauses=clauses,  # This will be JSON-serialized by the database module
+        content_hash=content_hash,
+        clauses_summary=clauses_summary,
+        text_preview=text_preview,
+        text_length=len(extracted_text)
     )
     
     if not document_id:
@@ -1260,10 +1909,7 @@ def upload_document():
     # Return the processed document information to the client
     # Include a text preview (first 500 chars) instead of full text
     
-    print(f"✓ Document processed successfully: ID={document_id}")
-    
-    # Create text preview (first 500 characters)
-    text_preview = extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text
+    logger.info("✓ Document processed successfully: ID=%s", document_id)
     
     # Build response
     response_data = {
@@ -1273,7 +1919,7 @@ def upload_document():
             'id': document_id,
             'filename': unique_filename,
             'original_filename': original_filename,
-            'upload_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'upload_date': upload_date,
             'clauses': clauses,
             'clauses_summary': clauses_summary,
             'text_preview': text_preview,
@@ -1354,10 +2000,11 @@ def get_documents():
     # -------------------------------------------------------------------------
     # Step 2: Fetch documents from database
     # -------------------------------------------------------------------------
-    # get_user_documents returns all documents belonging to this user,
-    # sorted by upload_date in descending order (newest first)
+    # get_user_documents_summary returns all documents belonging to this user,
+    # sorted by upload_date in descending order (newest first).
+    # It only loads the listed columns, never the full extracted text.
     
-    documents = get_user_documents(user_id)
+    documents = get_user_documents_summary(user_id)
     
     # -------------------------------------------------------------------------
     # Step 3: Process documents and create response
@@ -1368,8 +2015,9 @@ def get_documents():
     documents_list = []
     
     for doc in documents:
-        # Create clauses summary from the stored clauses data
-        clauses_summary = create_clauses_summary(doc.get('clauses'))
+        # Use the summary stored at upload time (older documents don't have
+        # one, so it is created from the stored clauses data)
+        clauses_summary = doc['clauses_summary'] or create_clauses_summary(doc.get('clauses'))
         
         # Build document object for response
         doc_info = {
@@ -1379,7 +2027,7 @@ def get_documents():
             'upload_date': doc['upload_date'],
             'clauses_summary': clauses_summary,
             # Include a flag indicating if text was extracted
-            'has_extracted_text': bool(doc.get('extracted_text'))
+            'has_extracted_text': doc['has_extracted_text']
         }
         
         documents_list.append(doc_info)
@@ -1388,7 +2036,7 @@ def get_documents():
     # Step 4: Return response
     # -------------------------------------------------------------------------
     
-    print(f"→ Documents retrieved for user {user_id}: {len(documents_list)} document(s)")
+    logger.info("→ Documents retrieved for user %s: %d document(s)", user_id, len(documents_list))
     
     return jsonify({
         'success': True,
@@ -1484,14 +2132,18 @@ def delete_document_route(document_id):
     
     Process:
         1. Verify user is authenticated
-        2. Fetch document from database
-        3. Verify document belongs to the user (authorization)
+        2. Delete the database record, if the document belongs to the user
+           (one DELETE statement that also returns the file path)
+        3. If nothing was deleted, find out why (missing vs. not owned)
         4. Delete the physical file from uploads folder
-        5. Delete the database record
-        6. Return success response
+        5. Return success response
     
     Notes:
-        - Physical file deletion happens before database deletion
+        - The database record is deleted before the physical file, so a
+          record never points at a file that is already gone
+        - The physical file is removed in the background after the
+          response; file_delete_scheduled means the removal was queued,
+          not that the file is already gone
         - If file deletion fails, the database record is still deleted
           (file might have been manually deleted)
         - Uses transactions implicitly via the database module
@@ -1511,81 +2163,66 @@ def delete_document_route(document_id):
         }), 401
     
     # -------------------------------------------------------------------------
-    # Step 2: Fetch document from database
+    # Step 2: Delete the database record (with ownership check)
     # -------------------------------------------------------------------------
-    # We need to verify the document exists and get its file path
-    # before we can delete it
+    # A user should only be able to delete their own documents. The
+    # ownership check is part of the DELETE statement itself, which also
+    # returns the file path - one query in the common (successful) case.
     
-    document = get_document_by_id(document_id)
-    
-    if not document:
-        return jsonify({
-            'success': False,
-            'error': 'Document not found.'
-        }), 404
+    file_path = delete_document_returning_path(document_id, user_id)
     
     # -------------------------------------------------------------------------
-    # Step 3: Verify ownership (authorization)
+    # Step 3: Explain a failed delete (not found vs. forbidden)
     # -------------------------------------------------------------------------
-    # A user should only be able to delete their own documents
-    # This is a critical security check to prevent unauthorized deletion
     
-    if document['user_id'] != user_id:
-        # Log this attempt - could indicate malicious activity
-        print(f"⚠ Unauthorized delete attempt: User {user_id} tried to delete document {document_id} owned by user {document['user_id']}")
+    if file_path is None:
+        owner_id = get_document_owner(document_id)
+        
+        if owner_id is None:
+            return jsonify({
+                'success': False,
+                'error': 'Document not found.'
+            }), 404
+        
+        if owner_id != user_id:
+            # Log this attempt - could indicate malicious activity
+            logger.warning("⚠ Unauthorized delete attempt: User %s tried to delete document %s owned by user %s",
+                           user_id, document_id, owner_id)
+            
+            return jsonify({
+                'success': False,
+                'error': "You don't have permission to delete this document."
+            }), 403  # 403 Forbidden
         
         return jsonify({
             'success': False,
-            'error': "You don't have permission to delete this document."
-        }), 403  # 403 Forbidden
+            'error': 'Failed to delete document from database.'
+        }), 500
     
     # -------------------------------------------------------------------------
     # Step 4: Delete the physical file
     # -------------------------------------------------------------------------
-    # Get the file path and attempt to delete the file
-    # We proceed with database deletion even if file deletion fails
-    # (the file might have been manually deleted or moved)
-    
-    file_path = document.get('file_path')
-    file_deleted = False
+    # The database record is already gone, so the response doesn't need to
+    # wait for the file: it is removed by a background thread. A missing
+    # file is not an error (it might have been manually deleted or moved).
     
-    if file_path and os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-            file_deleted = True
-            print(f"✓ Deleted file: {file_path}")
-        except OSError as e:
-            # Log the error but continue with database deletion
-            print(f"⚠ Could not delete file {file_path}: {e}")
-    else:
-        print(f"→ File not found on disk (may have been deleted): {file_path}")
+    file_delete_scheduled = bool(file_path)
+    if file_delete_scheduled:
+        delete_file_later(file_path)
     
     # -------------------------------------------------------------------------
-    # Step 5: Delete the database record
+    # Step 5: Return success response
     # -------------------------------------------------------------------------
-    # The delete_document function in database.py also verifies ownership
-    # as an additional security measure
     
-    deleted = delete_document(document_id, user_id)
-    
-    if not deleted:
-        return jsonify({
-            'success': False,
-            'error': 'Failed to delete document from database.'
-        }), 500
-    
-    # -------------------------------------------------------------------------
-    # Step 6: Return success response
-    # -------------------------------------------------------------------------
-    
-    print(f"✓ Document deleted: ID={document_id}, User={user_id}, File deleted={file_deleted}")
+    logger.info("✓ Document deleted: ID=%s, User=%s, File delete scheduled=%s",
+                document_id, user_id, file_delete_scheduled)
     
     return jsonify({
         'success': True,
         'message': 'Document deleted successfully',
         'details': {
             'document_id': document_id,
-            'file_deleted': file_deleted
+            'file_delete_scheduled': file_delete_scheduled
         }
     }), 200
 
@@ -1598,6 +2235,11 @@ def get_document_detail(document_id):
     This endpoint retrieves full details of a document including
     the extracted text and all identified clauses.
     
+    Query Parameters:
+        full (optional): "0" to leave out extracted_text. The text is then
+            not even loaded from the database; use text_preview and
+            text_length instead. Defaults to "1" (include the full text).
+    
     Authentication:
         Requires user to be logged in (user_id in session).
     
@@ -1616,7 +2258,9 @@ def get_document_detail(document_id):
                     "filename": "contract.pdf",
                     "original_filename": "My Contract.pdf",
                     "upload_date": "2025-02-06 10:30:00",
-                    "extracted_text": "Full text content...",
+                    "extracted_text": "Full text content...",  (omitted with ?full=0)
+                    "text_preview": "First 500 characters...",
+                    "text_length": 12345,
                     "clauses": {
                         "Termination": ["clause 1", "clause 2"],
                         "Payment": ["clause 3"],
@@ -1640,8 +2284,11 @@ def get_document_detail(document_id):
             'error': 'Not authenticated. Please log in or provide a valid access token.'
         }), 401
     
+    # Only load the full text when the client wants it
+    include_text = request.args.get('full', '1') != '0'
+    
     # Fetch document with ownership check
-    document = get_document_by_id(document_id, user_id)
+    document = get_document_by_id(document_id, user_id, include_text=include_text)
     
     if not document:
         return jsonify({
@@ -1649,22 +2296,28 @@ def get_document_detail(document_id):
             'error': 'Document not found or you do not have access.'
         }), 404
     
-    # Create clauses summary
-    clauses_summary = create_clauses_summary(document.get('clauses'))
+    # Use the stored clauses summary (created here for older documents)
+    clauses_summary = document['clauses_summary'] or create_clauses_summary(document.get('clauses'))
     
-    print(f"→ Document detail retrieved: ID={document_id}, User={user_id}")
+    logger.info("→ Document detail retrieved: ID=%s, User=%s", document_id, user_id)
+    
+    document_info = {
+        'id': document['id'],
+        'filename': document['filename'],
+        'original_filename': document['original_filename'],
+        'upload_date': document['upload_date'],
+        'text_preview': document['text_preview'] or '',
+        'text_length': document['text_length'] or 0,
+        'clauses': document.get('clauses', {}),
+        'clauses_summary': clauses_summary
+    }
+    
+    if include_text:
+        document_info['extracted_text'] = document.get('extracted_text', '')
     
     return jsonify({
         'success': True,
-        'document': {
-            'id': document['id'],
-            'filename': document['filename'],
-            'original_filename': document['original_filename'],
-            'upload_date': document['upload_date'],
-            'extracted_text': document.get('extracted_text', ''),
-            'clauses': document.get('clauses', {}),
-            'clauses_summary': clauses_summary
-        }
+        'document': document_info
     }), 200
 
 
@@ -1677,9 +2330,16 @@ def file_too_large(error):
     """
     Handle file size limit exceeded error.
     
-    This is triggered when an uploaded file exceeds MAX_CONTENT_LENGTH.
+    This is triggered when an uploaded file exceeds MAX_CONTENT_LENGTH,
+    or a register/login body exceeds AUTH_MAX_CONTENT_LENGTH.
     Returns a user-friendly error message.
     """
+    if request.path in AUTH_PATHS:
+        return jsonify({
+            'success': False,
+            'error': 'Request body too large.'
+        }), 413
+    
     return jsonify({
         'success': False,
         'error': 'File too large. Maximum size is 10 MB.'
@@ -1707,7 +2367,7 @@ def internal_error(error):
     Logs the error and returns a generic message to the user.
     Never expose internal error details to users in production.
     """
-    print(f"✗ Internal Server Error: {error}")
+    logger.error("✗ Internal Server Error: %s", error)
     return jsonify({
         'success': False,
         'error': 'An internal error occurred. Please try again later.'
@@ -1735,38 +2395,12 @@ if __name__ == '__main__':
     """
     
     # -------------------------------------------------------------------------
-    # Step 1: Create required directories
-    # -------------------------------------------------------------------------
-    # Ensure the uploads folder exists for storing PDF files
-    # Ensure the instance folder exists for the SQLite database
-    
-    print("\n" + "=" * 60)
-    print("  ContractIQ Backend - Startup")
-    print("=" * 60)
-    
-    # Create uploads directory if it doesn't exist
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
-        print(f"✓ Created uploads directory: {UPLOAD_FOLDER}")
-    else:
-        print(f"✓ Uploads directory exists: {UPLOAD_FOLDER}")
-    
-    # Create instance directory for SQLite database
-    instance_folder = os.path.join(os.path.dirname(__file__), 'instance')
-    if not os.path.exists(instance_folder):
-        os.makedirs(instance_folder)
-        print(f"✓ Created instance directory: {instance_folder}")
-    else:
-        print(f"✓ Instance directory exists: {instance_folder}")
-    
-    # -------------------------------------------------------------------------
-    # Step 2: Initialize the database
+    # Steps 1-2: Create required directories and initialize the database
     # -------------------------------------------------------------------------
-    # Create database tables if they don't exist
-    # This is safe to call multiple times (uses IF NOT EXISTS)
+    # create_app() ensures the uploads and instance folders exist and
+    # creates database tables if they don't exist
     
-    print("\n→ Initializing database...")
-    init_db()
+    create_app()
     
     # -------------------------------------------------------------------------
     # Step 3: Start the Flask development server
@@ -1818,7 +2452,7 @@ if __name__ == '__main__':
     print(f"  • API URL:        http://localhost:5000")
     print(f"  • Health Check:   http://localhost:5000/health")
     print(f"  • Upload Folder:  {UPLOAD_FOLDER}")
-    print(f"  • Database:       {instance_folder}/contractiq.db")
+    print(f"  • Database:       {INSTANCE_FOLDER}/contractiq.db")
     print(f"  • Max File Size:  10 MB")
     print(f"  • Debug Mode:     ON (auto-reload enabled)")
     print("=" * 60)
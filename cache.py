@@ -0,0 +1,93 @@
+# In-memory caching utilities
+# This module provides a small thread-safe cache with per-entry expiry
+# Used to avoid repeating database queries and token verification work
+
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a time-to-live.
+
+    Entries are dropped when they expire or, once the cache holds
+    maxsize entries, when they are the least recently used.
+
+    Args:
+        maxsize (int): Maximum number of entries kept
+        ttl (float): Default lifetime of an entry in seconds
+
+    Example:
+        users = TTLCache(maxsize=1024, ttl=60)
+        users.set(1, {'id': 1, 'username': 'john_doe'})
+        user = users.get(1)  # None once 60 seconds have passed
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Maps key -> (expires_at, value), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get a cached value.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry[0] <= time.monotonic():
+                # Expired - drop it so the caller fetches a fresh value
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache.
+
+        Args:
+            key: The cache key
+            value: The value to store (should not be modified afterwards)
+            ttl (float, optional): Lifetime in seconds, defaults to the cache's ttl
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            # Evict the least recently used entries when the cache is full
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """
+        Remove a value from the cache (no error if it isn't cached).
+
+        Args:
+            key: The cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every value from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -3,8 +3,27 @@
 # It identifies common legal clauses like termination, liability, payment, etc.
 
 import re
+import logging
+from bisect import bisect_left
 from typing import Dict, List
 
+# Hyperscan: optional SIMD multi-pattern matcher for large documents
+# Without it, keywords are matched with the compiled trie regex below
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# pyahocorasick: optional Aho-Corasick automaton (C extension), used when
+# Hyperscan isn't installed. Scans the whole document in one linear pass.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Module logger (messages below the configured level are skipped unformatted)
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # CLAUSE CATEGORIES AND KEYWORDS
 # =============================================================================
@@ -110,10 +129,259 @@ CLAUSE_KEYWORDS = {
 }
 
 
+# -----------------------------------------------------------------------------
+# COMPILED KEYWORD MATCHER
+# -----------------------------------------------------------------------------
+# Instead of testing every keyword of every category against each sentence,
+# all keywords are compiled once into a single trie-shaped regex. Keywords
+# sharing a prefix ("terminat-e", "terminat-ion") share one branch, so one
+# pass over a sentence finds every keyword occurrence.
+#
+# Keywords match as plain substrings of the lowercased sentence: "pay"
+# still matches inside "payment". The pattern is a lookahead, so it matches at
+# every position; at each position the regex reports the longest keyword,
+# and _KEYWORD_CATEGORIES maps it to the categories of every keyword that is
+# a prefix of it (those match at the same position too).
+
+def _build_keyword_trie_pattern(keywords):
+    """
+    Build a regex alternation for the keywords, structured as a trie.
+    
+    Args:
+        keywords (iterable): Lowercase keywords
+    
+    Returns:
+        str: Regex source matching any of the keywords (longest first)
+    
+    Example:
+        _build_keyword_trie_pattern(['pay', 'payment'])
+        # Result: 'pay(?:ment)?'
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-keyword marker
+    
+    def to_regex(node):
+        branches = [re.escape(char) + to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here - the longer continuations are optional
+            body = '(?:' + body + ')?'
+        return body
+    
+    return to_regex(trie)
+
+
+def _build_keyword_matcher(clause_keywords):
+    """
+    Compile the keyword matcher for a category -> keywords mapping.
+    
+    Args:
+        clause_keywords (dict): Category name -> list of keywords
+    
+    Returns:
+        tuple: (compiled pattern, dict of keyword -> frozenset of categories)
+    """
+    keyword_categories = {}
+    for category, keywords in clause_keywords.items():
+        for keyword in keywords:
+            keyword_categories.setdefault(keyword.lower(), set()).add(category)
+    
+    # The regex reports the longest keyword at a position, so attribute the
+    # categories of all keywords that are prefixes of it as well
+    matched_categories = {}
+    for keyword in keyword_categories:
+        categories = set()
+        for other, other_categories in keyword_categories.items():
+            if keyword.startswith(other):
+                categories |= other_categories
+        matched_categories[keyword] = frozenset(categories)
+    
+    pattern = re.compile('(?=(' + _build_keyword_trie_pattern(keyword_categories) + '))')
+    return pattern, matched_categories
+
+
+_KEYWORD_PATTERN, _KEYWORD_CATEGORIES = _build_keyword_matcher(CLAUSE_KEYWORDS)
+
+
+def _own_keyword_categories():
+    """
+    Map each lowercase keyword to the categories it is listed under.
+    
+    Unlike _KEYWORD_CATEGORIES this leaves out the categories of keywords
+    that are prefixes of it, for matchers that report every keyword
+    occurrence (including overlapping ones) separately.
+    
+    Returns:
+        dict: Keyword -> frozenset of categories
+    """
+    own_categories = {}
+    for category, category_keywords in CLAUSE_KEYWORDS.items():
+        for keyword in category_keywords:
+            own_categories.setdefault(keyword.lower(), set()).add(category)
+    
+    return {keyword: frozenset(categories) for keyword, categories in own_categories.items()}
+
+
+def _build_hyperscan_database(keyword_categories):
+    """
+    Compile the keywords into a Hyperscan block-mode database.
+    
+    Hyperscan reports every occurrence of every keyword (including
+    overlapping ones), so each keyword ID maps to its own categories.
+    
+    Args:
+        keyword_categories (dict): Keyword -> frozenset of categories
+    
+    Returns:
+        tuple: (hyperscan.Database, tuple of category sets indexed by keyword ID)
+    """
+    keywords = list(keyword_categories)
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[re.escape(keyword).encode() for keyword in keywords],
+        ids=list(range(len(keywords))),
+        # No HS_FLAG_SINGLEMATCH: every occurrence is needed to attribute
+        # keywords to all of the sentences they appear in
+        flags=[0] * len(keywords)
+    )
+    
+    # A keyword's own categories (not those of its prefixes - Hyperscan
+    # reports the prefix keywords separately)
+    own_categories = _own_keyword_categories()
+    
+    return database, tuple(own_categories[keyword] for keyword in keywords)
+
+
+def _build_ahocorasick_automaton():
+    """
+    Build an Aho-Corasick automaton over all keywords.
+    
+    Each keyword's value is its own set of categories; the automaton
+    reports prefix keywords ("pay" in "payment") as separate matches.
+    
+    Returns:
+        ahocorasick.Automaton: The finalized automaton
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword, categories in _own_keyword_categories().items():
+        automaton.add_word(keyword, categories)
+    automaton.make_automaton()
+    return automaton
+
+
+if hyperscan is not None:
+    _HS_DATABASE, _HS_CATEGORIES = _build_hyperscan_database(_KEYWORD_CATEGORIES)
+elif ahocorasick is not None:
+    _AC_AUTOMATON = _build_ahocorasick_automaton()
+
+
+def find_sentence_categories(normalized_sentences):
+    """
+    Find which clause categories each sentence belongs to.
+    
+    With Hyperscan (or else pyahocorasick) installed, all sentences are
+    scanned in a single pass and matches are attributed to sentences by
+    walking the sentence end offsets alongside the (ordered) matches.
+    Otherwise each sentence is scanned with the compiled keyword regex.
+    
+    Args:
+        normalized_sentences (list): Sentences from normalize_text()
+    
+    Returns:
+        list: One set of category names per sentence (empty if no match)
+    
+    Example:
+        find_sentence_categories(['payment is due', 'hello there'])
+        # Result: [{'Payment'}, set()]
+    """
+    sentence_categories = [set() for _ in normalized_sentences]
+    
+    if hyperscan is not None:
+        # Normalized sentences contain no newlines, so joining with '\n'
+        # guarantees no keyword match spans two sentences
+        encoded = [sentence.encode() for sentence in normalized_sentences]
+        
+        # Byte offset just past each sentence (and its separator)
+        sentence_ends = []
+        offset = 0
+        for sentence in encoded:
+            offset += len(sentence) + 1
+            sentence_ends.append(offset)
+        
+        # Matches arrive in order of end offset, so the current sentence only
+        # ever moves forward: walk it along instead of searching each time
+        current = [0]
+        
+        def on_match(keyword_id, start, end, flags, context):
+            index = current[0]
+            if index and sentence_ends[index - 1] >= end:
+                # Out-of-order match (not expected) - locate it directly
+                index = bisect_left(sentence_ends, end)
+            while sentence_ends[index] < end:
+                index += 1
+            current[0] = index
+            sentence_categories[index].update(_HS_CATEGORIES[keyword_id])
+        
+        # Scratch space is per scan, so concurrent uploads don't share it
+        _HS_DATABASE.scan(
+            b'\n'.join(encoded),
+            match_event_handler=on_match,
+            scratch=hyperscan.Scratch(_HS_DATABASE)
+        )
+        return sentence_categories
+    
+    if ahocorasick is not None:
+        # Same single pass as above, over the joined text: the automaton
+        # yields (end index, categories) in order of end index
+        sentence_ends = []
+        offset = 0
+        for sentence in normalized_sentences:
+            offset += len(sentence) + 1
+            sentence_ends.append(offset)
+        
+        index = 0
+        for end, categories in _AC_AUTOMATON.iter('\n'.join(normalized_sentences)):
+            while sentence_ends[index] <= end:
+                index += 1
+            sentence_categories[index].update(categories)
+        return sentence_categories
+    
+    for index, sentence in enumerate(normalized_sentences):
+        for keyword in _KEYWORD_PATTERN.findall(sentence):
+            sentence_categories[index] |= _KEYWORD_CATEGORIES[keyword]
+    
+    return sentence_categories
+
+
 # =============================================================================
 # TEXT PROCESSING UTILITIES
 # =============================================================================
 
+# Common abbreviations whose period doesn't end a sentence
+SENTENCE_ABBREVIATIONS = (
+    'Dr.', 'Mr.', 'Mrs.', 'Ms.', 'Jr.', 'Sr.', 'Inc.', 'Ltd.', 'Corp.',
+    'vs.', 'etc.', 'i.e.', 'e.g.', 'a.m.', 'p.m.', 'U.S.', 'U.K.'
+)
+
+# Sentence boundary: whitespace after a period, exclamation or question
+# mark, unless the text before it ends with one of the abbreviations.
+# Python lookbehinds must be fixed-width, so each abbreviation gets its own
+# negative lookbehind; they only run where the cheap (?<=[.!?]) matched.
+_SENTENCE_SPLIT_PATTERN = re.compile(
+    r'(?<=[.!?])'
+    + ''.join(f'(?<!{re.escape(abbr)})' for abbr in SENTENCE_ABBREVIATIONS)
+    + r'\s+'
+)
+
+
 def split_into_sentences(text):
     """
     Split text into individual sentences.
@@ -143,37 +411,13 @@ def split_into_sentences(text):
         return []
     
     # -------------------------------------------------------------------------
-    # Method 1: Regex-based sentence splitting
+    # Regex-based sentence splitting
     # -------------------------------------------------------------------------
-    # This regex looks for sentence boundaries:
-    # - Period, exclamation, or question mark
-    # - Followed by one or more spaces
-    # - Followed by an uppercase letter (start of new sentence)
-    # 
-    # The (?=[A-Z]) is a lookahead - it checks but doesn't consume the capital
-    
-    # First, normalize the text
-    text = text.strip()
-    
-    # Handle common abbreviations that shouldn't split sentences
-    # Replace periods in common abbreviations with a placeholder
-    abbreviations = [
-        'Dr.', 'Mr.', 'Mrs.', 'Ms.', 'Jr.', 'Sr.', 'Inc.', 'Ltd.', 'Corp.',
-        'vs.', 'etc.', 'i.e.', 'e.g.', 'a.m.', 'p.m.', 'U.S.', 'U.K.'
-    ]
-    
-    # Temporarily replace abbreviation periods with a placeholder
-    placeholder = "<<<PERIOD>>>"
-    for abbr in abbreviations:
-        text = text.replace(abbr, abbr.replace('.', placeholder))
-    
-    # Split on sentence-ending punctuation followed by space
-    # This regex splits on: . or ! or ? followed by space(s)
-    sentence_pattern = r'(?<=[.!?])\s+'
-    sentences = re.split(sentence_pattern, text)
-    
-    # Restore the periods in abbreviations
-    sentences = [s.replace(placeholder, '.') for s in sentences]
+    # _SENTENCE_SPLIT_PATTERN splits on whitespace that follows . ! or ?,
+    # except after an abbreviation (SENTENCE_ABBREVIATIONS). The
+    # abbreviations are skipped by the pattern itself, so the text is
+    # never copied to mask their periods.
+    sentences = _SENTENCE_SPLIT_PATTERN.split(text.strip())
     
     # Clean up each sentence
     cleaned_sentences = []
@@ -188,6 +432,46 @@ def split_into_sentences(text):
     return cleaned_sentences
 
 
+def iter_sentences(text):
+    """
+    Yield the sentences of a text one at a time.
+    
+    Produces the same sentences as split_into_sentences(), without
+    building the list, for callers that handle one sentence at a time
+    and may stop early. (split_into_sentences() is faster when every
+    sentence is needed.)
+    
+    Args:
+        text (str): The text to split into sentences
+    
+    Yields:
+        str: Each sentence, cleaned and trimmed
+    
+    Example:
+        for sentence in iter_sentences(text):
+            if 'arbitration' in sentence.lower():
+                break
+    """
+    if not text:
+        return
+    
+    # The sentences are the pieces between _SENTENCE_SPLIT_PATTERN matches
+    text = text.strip()
+    start = 0
+    for boundary in _SENTENCE_SPLIT_PATTERN.finditer(text):
+        # Strip whitespace
+        sentence = text[start:boundary.start()].strip()
+        start = boundary.end()
+        
+        # Skip empty sentences or very short fragments
+        if len(sentence) > 5:  # Minimum sentence length
+            yield sentence
+    
+    sentence = text[start:].strip()
+    if len(sentence) > 5:
+        yield sentence
+
+
 def normalize_text(text):
     """
     Normalize text for keyword matching.
@@ -204,13 +488,12 @@ def normalize_text(text):
     if not text:
         return ""
     
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Replace multiple whitespace with single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    # Convert to lowercase, then collapse whitespace: str.split() with no
+    # separator splits on runs of exactly the characters regex \s matches
+    # and drops leading/trailing whitespace, so joining the words with
+    # single spaces equals re.sub(r'\s+', ' ', text).strip() - without a
+    # regex engine pass over every sentence
+    return ' '.join(text.lower().split())
 
 
 # =============================================================================
@@ -228,7 +511,9 @@ def extract_clauses(text):
     Algorithm:
     1. Split the input text into individual sentences
     2. For each sentence, normalize it for matching (lowercase)
-    3. Check if any keywords from each category appear in the sentence
+    3. Find all keywords in the sentences (one Hyperscan or Aho-Corasick
+       pass over the document, or the precompiled keyword regex per
+       sentence) and look up the categories they belong to
     4. If a keyword is found, add the original sentence to that category
     5. A sentence can appear in multiple categories if it contains
        keywords from different categories
@@ -270,7 +555,7 @@ def extract_clauses(text):
     
     # Handle empty or None input
     if not text or not text.strip():
-        print("→ No text provided for clause extraction")
+        logger.info("→ No text provided for clause extraction")
         return extracted_clauses
     
     # -------------------------------------------------------------------------
@@ -279,10 +564,10 @@ def extract_clauses(text):
     sentences = split_into_sentences(text)
     
     if not sentences:
-        print("→ No sentences found in text")
+        logger.info("→ No sentences found in text")
         return extracted_clauses
     
-    print(f"→ Analyzing {len(sentences)} sentences for clause extraction...")
+    logger.info("→ Analyzing %d sentences for clause extraction...", len(sentences))
     
     # -------------------------------------------------------------------------
     # Step 2: Analyze each sentence
@@ -290,71 +575,41 @@ def extract_clauses(text):
     # Track statistics for logging
     total_matches = 0
     
-    for sentence in sentences:
-        # Normalize the sentence for matching (lowercase)
-        normalized_sentence = normalize_text(sentence)
-        
-        # Check each category's keywords against this sentence
-        for category, keywords in CLAUSE_KEYWORDS.items():
-            # Check if any keyword from this category appears in the sentence
-            if contains_keyword(normalized_sentence, keywords):
-                # Add the ORIGINAL sentence (not normalized) to preserve formatting
-                # Avoid duplicates (same sentence shouldn't appear twice in same category)
-                if sentence not in extracted_clauses[category]:
-                    extracted_clauses[category].append(sentence)
-                    total_matches += 1
+    # Normalize the sentences for matching (lowercase) and find the
+    # categories of the keywords in each one
+    normalized_sentences = [normalize_text(sentence) for sentence in sentences]
+    sentence_categories = find_sentence_categories(normalized_sentences)
+    
+    # Sentences already added to each category (set lookups stay O(1)
+    # however many clauses a category collects)
+    seen_sentences = {category: set() for category in extracted_clauses}
+    
+    for sentence, categories in zip(sentences, sentence_categories):
+        for category in categories:
+            # Add the ORIGINAL sentence (not normalized) to preserve formatting
+            # Avoid duplicates (same sentence shouldn't appear twice in same category)
+            if sentence not in seen_sentences[category]:
+                seen_sentences[category].add(sentence)
+                extracted_clauses[category].append(sentence)
+                total_matches += 1
     
     # -------------------------------------------------------------------------
     # Step 3: Log results
     # -------------------------------------------------------------------------
-    print(f"✓ Clause extraction complete:")
-    for category, clauses in extracted_clauses.items():
-        count = len(clauses)
-        if count > 0:
-            print(f"  • {category}: {count} clause(s) found")
-    
-    if total_matches == 0:
-        print("  → No clauses identified (text may not be a contract)")
+    # One record per document; the per-category breakdown is only built
+    # when INFO messages are actually being logged
+    if logger.isEnabledFor(logging.INFO):
+        if total_matches == 0:
+            logger.info("✓ Clause extraction complete: No clauses identified (text may not be a contract)")
+        else:
+            logger.info("✓ Clause extraction complete: %s", ', '.join(
+                f"{category}: {len(clauses)}"
+                for category, clauses in extracted_clauses.items() if clauses
+            ))
     
     return extracted_clauses
 
 
-def contains_keyword(text, keywords):
-    """
-    Check if any keyword from the list appears in the text.
-    
-    This function performs intelligent keyword matching:
-    - For single-word keywords: Uses word boundary matching to avoid partial matches
-      (e.g., "pay" should match "pay" but ideally not "payment" - though we 
-       include both separately in our keyword lists for clarity)
-    - For multi-word keywords: Checks if the phrase appears anywhere in text
-    
-    Args:
-        text (str): Normalized (lowercase) text to search in
-        keywords (list): List of keywords to search for
-    
-    Returns:
-        bool: True if any keyword is found, False otherwise
-    
-    Example:
-        text = "the company shall indemnify the contractor"
-        keywords = ["indemnify", "liability"]
-        result = contains_keyword(text, keywords)  # Returns True
-    """
-    for keyword in keywords:
-        # Convert keyword to lowercase for matching
-        keyword_lower = keyword.lower()
-        
-        # Check if keyword appears in text
-        # For multi-word keywords, simple 'in' check works well
-        # For single words, we could use regex word boundaries, but
-        # for legal text, the simple approach works well enough
-        if keyword_lower in text:
-            return True
-    
-    return False
-
-
 # =============================================================================
 # ADVANCED CLAUSE ANALYSIS FUNCTIONS
 # =============================================================================
@@ -437,14 +692,19 @@ def search_custom_keywords(text, custom_keywords):
     if not text or not custom_keywords:
         return []
     
-    sentences = split_into_sentences(text)
     matching_sentences = []
+    seen_sentences = set()
     
-    for sentence in sentences:
+    # Lowercase the keywords once, not once per sentence
+    keywords_lower = [keyword.lower() for keyword in custom_keywords]
+    
+    # Each sentence is checked and dropped before the next is split off
+    for sentence in iter_sentences(text):
         normalized = normalize_text(sentence)
-        for keyword in custom_keywords:
-            if keyword.lower() in normalized:
-                if sentence not in matching_sentences:
+        for keyword in keywords_lower:
+            if keyword in normalized:
+                if sentence not in seen_sentences:
+                    seen_sentences.add(sentence)
                     matching_sentences.append(sentence)
                 break  # Found a match, no need to check other keywords
     
@@ -455,16 +715,21 @@ def search_custom_keywords(text, custom_keywords):
 # AVAILABLE CATEGORIES (for API/frontend use)
 # =============================================================================
 
+# Category names, fixed at import time (a tuple, so it can't be modified)
+_CATEGORY_NAMES = tuple(CLAUSE_KEYWORDS)
+
+
 def get_available_categories():
     """
     Get list of all available clause categories.
     
     Useful for populating dropdowns or filters in the frontend.
+    Each call returns a new list, so callers may modify it.
     
     Returns:
         list: List of category names
     """
-    return list(CLAUSE_KEYWORDS.keys())
+    return list(_CATEGORY_NAMES)
 
 
 def get_category_keywords(category):
@@ -487,6 +752,9 @@ def get_category_keywords(category):
 # =============================================================================
 
 if __name__ == '__main__':
+    # Show this module's log messages on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Test the clause extraction with sample contract text
     print("=" * 60)
     print("Clause Extractor - Test Mode")
@@ -4,47 +4,168 @@
 
 import sqlite3
 import os
-import json
+import queue
+import logging
 from datetime import datetime
 
+# orjson: Fast JSON serialization written in Rust (also used for API responses)
+import orjson
+
+from cache import TTLCache
+
+# MessagePack is a compact binary format that encodes and decodes faster
+# than JSON. It is optional: without it, clauses are stored as JSON text.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Module logger (messages below the configured level are skipped unformatted)
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # DATABASE CONFIGURATION
 # =============================================================================
 
+# Directory containing this module, resolved once at import
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Database file path - stored in the instance folder for Flask convention
 # The instance folder is typically used for deployment-specific files
-DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'instance', 'contractiq.db')
+DATABASE_PATH = os.path.join(BASE_DIR, 'instance', 'contractiq.db')
 
+# Version of the schema created by init_db(), stored in the database file
+# (PRAGMA user_version). init_db() skips all schema statements when the
+# file is already at this version.
+# Increase it whenever init_db() creates or alters anything new.
+SCHEMA_VERSION = 5
 
-def get_db_connection():
+
+# Connection pool size
+# Opening a SQLite connection means opening the file and parsing the schema,
+# so finished connections are kept and handed to the next caller instead of
+# being closed. Up to DB_POOL_SIZE idle connections are kept; extra ones
+# created under load are closed when released.
+# Defaults to the gunicorn thread count so every worker thread can keep a
+# warm connection; set DB_POOL_SIZE to tune it for other worker setups.
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', os.environ.get('GUNICORN_THREADS', 8)))
+
+# Idle connections, most recently used first (LIFO keeps caches warm)
+_connection_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+# Memory-mapped I/O size in bytes (DB_MMAP_SIZE env var, 0 disables it)
+# Reads of large rows (extracted text, clauses) are then served straight
+# from the OS page cache instead of a read() call per page. The mapping
+# is shared by all connections, so it costs no memory per connection.
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 256 * 1024 * 1024))  # 256 MB
+
+# Page cache size per connection in KiB (DB_CACHE_SIZE_KB env var)
+# Every pooled connection has its own cache, so the total is up to
+# DB_POOL_SIZE times this.
+DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', 16 * 1024))  # 16 MB
+
+# Page size for new database files (has no effect on existing ones)
+DB_PAGE_SIZE = 8192
+
+# INSERT/DELETE ... RETURNING needs SQLite 3.35+; older versions run a
+# separate SELECT instead
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Process that owns the pooled connections. SQLite connections must not be
+# shared across fork(), so a forked worker starts with an empty pool.
+_pool_pid = os.getpid()
+
+
+def _create_connection():
     """
-    Create and return a database connection.
+    Open a new configured SQLite connection.
     
-    This function establishes a connection to the SQLite database.
     - Row factory is set to sqlite3.Row to enable column access by name
-    - This allows us to access results like dictionaries (row['column_name'])
+    - check_same_thread=False lets a pooled connection be reused by
+      whichever worker thread checks it out next (only one at a time)
+    - Per-connection PRAGMAs are applied once here, not on every checkout
     
     Returns:
-        sqlite3.Connection: A connection object to the database
-    
-    Example:
-        conn = get_db_connection()
-        cursor = conn.execute("SELECT * FROM users")
-        conn.close()
+        sqlite3.Connection: A new connection object to the database
     """
-    # Ensure the instance directory exists before connecting
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    
     # Create connection with row factory for dict-like access
-    conn = sqlite3.connect(DATABASE_PATH)
+    try:
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+    except sqlite3.OperationalError:
+        # First connection of a new install: the instance directory doesn't
+        # exist yet. Create it here rather than checking on every connect.
+        os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     
     # Enable foreign key support (disabled by default in SQLite)
     conn.execute("PRAGMA foreign_keys = ON")
     
+    # In WAL mode (set by init_db), NORMAL only syncs at checkpoints
+    # and is still safe against corruption
+    conn.execute("PRAGMA synchronous = NORMAL")
+    
+    # Keep temporary tables and indices (e.g. for sorting) in memory
+    conn.execute("PRAGMA temp_store = MEMORY")
+    
+    # Map the database file into memory and size the page cache
+    # (a negative cache_size is in KiB rather than pages)
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE:d}")
+    conn.execute(f"PRAGMA cache_size = {-DB_CACHE_SIZE_KB:d}")
+    
     return conn
 
 
+def get_db_connection():
+    """
+    Get a database connection from the pool.
+    
+    Returns an idle pooled connection, or opens a new one if none is
+    available. Every connection must be handed back with
+    release_db_connection() when the caller is done with it.
+    
+    Returns:
+        sqlite3.Connection: A connection object to the database
+    
+    Example:
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute("SELECT * FROM users")
+        finally:
+            release_db_connection(conn)
+    """
+    global _connection_pool, _pool_pid
+    
+    if _pool_pid != os.getpid():
+        # Forked after connections were pooled (e.g. gunicorn --preload):
+        # leave the parent's connections alone and start a fresh pool
+        _connection_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+        _pool_pid = os.getpid()
+    
+    try:
+        return _connection_pool.get_nowait()
+    except queue.Empty:
+        return _create_connection()
+
+
+def release_db_connection(conn):
+    """
+    Return a connection to the pool (or close it if the pool is full).
+    
+    Any transaction left open (e.g. after an error) is rolled back first,
+    so the next caller always gets a clean connection.
+    
+    Args:
+        conn (sqlite3.Connection): A connection from get_db_connection()
+    """
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        _connection_pool.put_nowait(conn)
+    except (sqlite3.Error, queue.Full):
+        conn.close()
+
+
 # =============================================================================
 # DATABASE INITIALIZATION
 # =============================================================================
@@ -61,9 +182,16 @@ def init_db():
     The function uses 'IF NOT EXISTS' to prevent errors if tables already exist.
     This makes it safe to call multiple times (idempotent).
     
+    The database records the schema version it was brought up to, so on
+    later starts a database already at SCHEMA_VERSION is only checked,
+    not re-created statement by statement.
+    
     Returns:
         bool: True if initialization was successful
     
+    Raises:
+        RuntimeError: If the database can't be switched to WAL journal mode
+    
     Example:
         if init_db():
             print("Database ready!")
@@ -72,6 +200,48 @@ def init_db():
     cursor = conn.cursor()
     
     try:
+        # ---------------------------------------------------------------------
+        # FILE SETTINGS
+        # ---------------------------------------------------------------------
+        # Larger pages hold more of a document row per page. Only applies to
+        # a new, empty database file (before the first table is created).
+        cursor.execute(f'PRAGMA page_size = {DB_PAGE_SIZE:d}')
+        
+        # Write-Ahead Logging lets readers proceed while a write is in progress
+        # (the default rollback journal blocks all readers during writes).
+        # journal_mode is stored in the database file, so for an existing
+        # database this only confirms it. It must run before any other
+        # statement: SQLite silently ignores a journal_mode change inside a
+        # transaction. Connections use synchronous=NORMAL, which is only
+        # safe in WAL mode, so refuse to start without it.
+        journal_mode = cursor.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+        if journal_mode.lower() != 'wal':
+            raise RuntimeError(
+                f"Could not enable WAL journal mode for {DATABASE_PATH} "
+                f"(journal_mode is '{journal_mode}')"
+            )
+        
+        # ---------------------------------------------------------------------
+        # SCHEMA VERSION CHECK
+        # ---------------------------------------------------------------------
+        # A new database file has user_version 0
+        if cursor.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+            logger.info("✓ Database schema is up to date at: %s", DATABASE_PATH)
+            return True
+        
+        # Hold the write lock for the whole upgrade: workers starting at the
+        # same time upgrade one after another, and no document can be written
+        # between creating the stats triggers and counting existing documents
+        cursor.execute('BEGIN IMMEDIATE')
+        
+        # Read the version again under the lock - another process may have
+        # finished the upgrade while we waited
+        schema_version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        if schema_version == SCHEMA_VERSION:
+            conn.commit()
+            logger.info("✓ Database schema is up to date at: %s", DATABASE_PATH)
+            return True
+        
         # ---------------------------------------------------------------------
         # USERS TABLE
         # ---------------------------------------------------------------------
@@ -103,7 +273,8 @@ def init_db():
         # - original_filename: The original name of the uploaded file
         # - file_path: Full path to where the PDF is stored on disk
         # - extracted_text: The full text content extracted from the PDF
-        # - clauses: JSON string containing identified contract clauses
+        # - clauses: Identified contract clauses, as a MessagePack BLOB or a
+        #   JSON string (see _encode_clauses)
         # - upload_date: When the document was uploaded
         # 
         # ON DELETE CASCADE: If a user is deleted, their documents are also deleted
@@ -121,25 +292,121 @@ def init_db():
             )
         ''')
         
+        # ---------------------------------------------------------------------
+        # USER DOCUMENT STATS TABLE
+        # ---------------------------------------------------------------------
+        # Per-user document counts for the dashboard, kept up to date by the
+        # triggers below so the dashboard reads one row instead of counting
+        # all of a user's documents on every visit
+        # - user_id: The user the counts belong to
+        # - total_documents: Number of documents the user has uploaded
+        # - documents_with_clauses: How many of them have extracted clauses
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_document_stats (
+                user_id INTEGER PRIMARY KEY,
+                total_documents INTEGER NOT NULL DEFAULT 0,
+                documents_with_clauses INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+        ''')
+        
+        # Adjust the counts whenever documents are added, removed or change
+        # owner/clauses ("clauses IS NOT NULL" is 1 or 0 in SQLite)
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_documents_stats_insert
+            AFTER INSERT ON documents
+            BEGIN
+                INSERT OR IGNORE INTO user_document_stats (user_id) VALUES (NEW.user_id);
+                UPDATE user_document_stats
+                SET total_documents = total_documents + 1,
+                    documents_with_clauses = documents_with_clauses + (NEW.clauses IS NOT NULL)
+                WHERE user_id = NEW.user_id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_documents_stats_delete
+            AFTER DELETE ON documents
+            BEGIN
+                UPDATE user_document_stats
+                SET total_documents = total_documents - 1,
+                    documents_with_clauses = documents_with_clauses - (OLD.clauses IS NOT NULL)
+                WHERE user_id = OLD.user_id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_documents_stats_update
+            AFTER UPDATE OF user_id, clauses ON documents
+            BEGIN
+                UPDATE user_document_stats
+                SET total_documents = total_documents - 1,
+                    documents_with_clauses = documents_with_clauses - (OLD.clauses IS NOT NULL)
+                WHERE user_id = OLD.user_id;
+                INSERT OR IGNORE INTO user_document_stats (user_id) VALUES (NEW.user_id);
+                UPDATE user_document_stats
+                SET total_documents = total_documents + 1,
+                    documents_with_clauses = documents_with_clauses + (NEW.clauses IS NOT NULL)
+                WHERE user_id = NEW.user_id;
+            END
+        ''')
+        
+        # The stats table was added in schema version 4. When upgrading an
+        # older database, count the documents it already has (the triggers
+        # keep the counts current from here on). This runs once, in the same
+        # transaction that creates the table and triggers.
+        if schema_version < 4:
+            cursor.execute('''
+                INSERT INTO user_document_stats (user_id, total_documents, documents_with_clauses)
+                SELECT user_id, COUNT(*), COUNT(clauses) FROM documents GROUP BY user_id
+            ''')
+        
+        # ---------------------------------------------------------------------
+        # COLUMNS ADDED AFTER THE FIRST RELEASE
+        # ---------------------------------------------------------------------
+        # CREATE TABLE IF NOT EXISTS leaves existing tables unchanged, so
+        # columns added later are added to older databases here
+        # - content_hash: BLAKE2b digest of the uploaded PDF bytes, used to
+        #   reuse the analysis of an identical, previously uploaded file
+        _add_column_if_missing(cursor, 'documents', 'content_hash', 'TEXT')
+        # - clauses_summary: JSON clause counts per category, computed at
+        #   upload so document lists don't parse and count every clause
+        _add_column_if_missing(cursor, 'documents', 'clauses_summary', 'TEXT')
+        # - text_preview / text_length: First 500 characters and length of
+        #   the extracted text, so details can be served without the text
+        _add_column_if_missing(cursor, 'documents', 'text_preview', 'TEXT')
+        _add_column_if_missing(cursor, 'documents', 'text_length', 'INTEGER')
+        
         # Create indexes for faster queries on frequently searched columns
         # Indexes speed up SELECT queries but slightly slow down INSERT/UPDATE
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_user_id ON documents(user_id)')
+        # (user_id, upload_date DESC) returns a user's documents already in
+        # list order, so listings need no sort. It also serves every plain
+        # user_id lookup, which makes the older single-column index redundant.
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_user_date ON documents(user_id, upload_date DESC)')
+        cursor.execute('DROP INDEX IF EXISTS idx_documents_user_id')
+        # The dashboard's "documents with clauses" count now comes from
+        # user_document_stats, so its partial index is no longer needed
+        cursor.execute('DROP INDEX IF EXISTS idx_documents_user_clauses')
+        # Re-uploads are only matched against the uploader's own documents
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_user_hash ON documents(user_id, content_hash)')
+        cursor.execute('DROP INDEX IF EXISTS idx_documents_content_hash')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
         
+        # Record the schema version (PRAGMA values can't be bound parameters)
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION:d}')
+        
         # Commit all changes to the database
         conn.commit()
-        print(f"✓ Database initialized successfully at: {DATABASE_PATH}")
+        logger.info("✓ Database initialized successfully at: %s", DATABASE_PATH)
         return True
         
     except sqlite3.Error as e:
         # If anything goes wrong, print the error
-        print(f"✗ Database initialization error: {e}")
+        logger.error("✗ Database initialization error: %s", e)
         return False
         
     finally:
-        # Always close the connection, even if an error occurred
-        conn.close()
+        # Always release the connection, even if an error occurred
+        release_db_connection(conn)
 
 
 # =============================================================================
@@ -172,32 +439,30 @@ def create_user(username, email, password_hash, role='client'):
         user_id = create_user('john_doe', 'john@example.com', hashed, 'lawyer')
     """
     conn = get_db_connection()
-    cursor = conn.cursor()
     
     try:
-        cursor.execute('''
+        # lastrowid gives us the ID of the just-inserted row
+        user_id = conn.execute('''
             INSERT INTO users (username, email, password_hash, role)
             VALUES (?, ?, ?, ?)
-        ''', (username, email, password_hash, role))
+        ''', (username, email, password_hash, role)).lastrowid
         
         conn.commit()
         
-        # lastrowid gives us the ID of the just-inserted row
-        user_id = cursor.lastrowid
-        print(f"✓ User created successfully: {username} (ID: {user_id})")
+        logger.info("✓ User created successfully: %s (ID: %s)", username, user_id)
         return user_id
         
     except sqlite3.IntegrityError as e:
         # This happens if username or email already exists (UNIQUE constraint)
-        print(f"✗ User creation failed - duplicate entry: {e}")
+        logger.info("✗ User creation failed - duplicate entry: %s", e)
         return None
         
     except sqlite3.Error as e:
-        print(f"✗ User creation error: {e}")
+        logger.error("✗ User creation error: %s", e)
         return None
         
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 def get_user_by_username(username):
@@ -235,11 +500,11 @@ def get_user_by_username(username):
         return None
         
     except sqlite3.Error as e:
-        print(f"✗ Error fetching user by username: {e}")
+        logger.error("✗ Error fetching user by username: %s", e)
         return None
         
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 def get_user_by_email(email):
@@ -277,11 +542,11 @@ def get_user_by_email(email):
         return None
         
     except sqlite3.Error as e:
-        print(f"✗ Error fetching user by email: {e}")
+        logger.error("✗ Error fetching user by email: %s", e)
         return None
         
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 def get_user_by_id(user_id):
@@ -318,18 +583,214 @@ def get_user_by_id(user_id):
         return None
         
     except sqlite3.Error as e:
-        print(f"✗ Error fetching user by ID: {e}")
+        logger.error("✗ Error fetching user by ID: %s", e)
         return None
         
     finally:
-        conn.close()
+        release_db_connection(conn)
+
+
+def update_user_password_hash(user_id, password_hash):
+    """
+    Replace a user's stored password hash.
+    
+    Used to upgrade hashes to the current hashing method or cost
+    when the user logs in.
+    
+    Args:
+        user_id (int): The unique ID of the user
+        password_hash (str): The new pre-hashed password
+    
+    Returns:
+        bool: True if the user was updated, False otherwise
+    """
+    conn = get_db_connection()
+    
+    try:
+        cursor = conn.execute(
+            'UPDATE users SET password_hash = ? WHERE id = ?',
+            (password_hash, user_id)
+        )
+        conn.commit()
+        return cursor.rowcount > 0
+        
+    except sqlite3.Error as e:
+        logger.error("✗ Error updating password hash: %s", e)
+        return False
+        
+    finally:
+        release_db_connection(conn)
+
+
+# =============================================================================
+# USER CACHE
+# =============================================================================
+
+# Every authenticated request needs the current user's record, but user rows
+# rarely change. Keeping recently used users in memory for a short time saves
+# one SQLite round-trip per request. The cache lives in each server process,
+# so after a change to a user's record other gunicorn workers can serve the
+# old record for up to USER_CACHE_TTL seconds.
+# - USER_CACHE_TTL: Seconds a cached user stays valid
+# - USER_CACHE_MAXSIZE: Maximum number of users kept (least recently used are dropped)
+USER_CACHE_TTL = 60
+USER_CACHE_MAXSIZE = 4096
+
+_user_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+
+
+def get_cached_user_by_id(user_id):
+    """
+    Retrieve a user record by ID, served from an in-memory TTL cache.
+    
+    On a cache miss (or expired entry) the user is loaded with
+    get_user_by_id() and stored for USER_CACHE_TTL seconds.
+    Missing users are not cached, so a newly created account is
+    visible immediately.
+    
+    Args:
+        user_id (int): The unique ID of the user
+    
+    Returns:
+        dict: A copy of the user data (without password_hash),
+              or None if user not found
+    
+    Example:
+        user = get_cached_user_by_id(1)
+        if user:
+            print(f"User role: {user['role']}")
+    """
+    user = _user_cache.get(user_id)
+    
+    if user is None:
+        user = get_user_by_id(user_id)
+        if not user:
+            return None
+        _user_cache.set(user_id, user)
+    
+    # Return a copy so callers can't modify the cached record
+    return dict(user)
+
+
+# Columns kept in the user cache - the same ones get_user_by_id() returns
+_CACHED_USER_FIELDS = ('id', 'username', 'email', 'role', 'created_at')
+
+
+def prime_user_cache(user):
+    """
+    Store a user record that was just loaded some other way in the user cache.
+    
+    Login already reads the full user row (by email), and the client's
+    next request looks the same user up by ID. Caching the row here means
+    that lookup doesn't need another query. Only the fields returned by
+    get_user_by_id() are kept - never the password hash.
+    
+    Args:
+        user (dict): A user record containing at least the fields
+                     returned by get_user_by_id()
+    
+    Example:
+        user = get_user_by_email(email)
+        if user and verify_password(user['password_hash'], password):
+            prime_user_cache(user)
+    """
+    _user_cache.set(user['id'], {field: user[field] for field in _CACHED_USER_FIELDS})
+
+
+def invalidate_user_cache(user_id=None):
+    """
+    Remove a user (or every user) from this process's user cache.
+    
+    Call this after changing a user's record so the next lookup in this
+    process reads fresh data from the database. Other server processes
+    keep their cached copy until it expires (USER_CACHE_TTL).
+    
+    Args:
+        user_id (int, optional): The user to drop. If omitted, the whole cache is cleared.
+    """
+    if user_id is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(user_id)
 
 
 # =============================================================================
 # DOCUMENT MANAGEMENT FUNCTIONS
 # =============================================================================
 
-def save_document(user_id, filename, original_filename, file_path, extracted_text=None, clauses=None):
+def _add_column_if_missing(cursor, table, column, declaration):
+    """
+    Add a column to an existing table unless it is already there.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor inside init_db()'s transaction
+        table (str): Table name (trusted, not user input)
+        column (str): Column name (trusted, not user input)
+        declaration (str): Column type and constraints, e.g. 'TEXT'
+    """
+    existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+    if column not in existing:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+
+def _encode_clauses(clauses):
+    """
+    Serialize clauses for the documents.clauses column.
+    
+    Uses MessagePack (stored as a BLOB) when msgpack is installed,
+    otherwise JSON text.
+    
+    Args:
+        clauses (dict/list): Clauses to store
+    
+    Returns:
+        bytes or str: The serialized clauses, or None if there are none
+    """
+    if not clauses:
+        return None
+    if msgpack is not None:
+        return msgpack.packb(clauses, use_bin_type=True)
+    return orjson.dumps(clauses).decode('utf-8')
+
+
+def _decode_clauses(value):
+    """
+    Parse a documents.clauses value written by _encode_clauses().
+    
+    BLOBs are MessagePack and text is JSON, so documents saved before
+    MessagePack was used (or without it installed) still load.
+    
+    Args:
+        value (bytes or str): The stored column value
+    
+    Returns:
+        dict/list: The clauses, or None if nothing is stored
+    
+    Raises:
+        ValueError: If the stored value cannot be parsed
+    """
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        if msgpack is None:
+            raise ValueError("clauses are stored as MessagePack, but msgpack is not installed")
+        return msgpack.unpackb(value, raw=False)
+    return orjson.loads(value)
+
+
+# INSERT used by save_document(). Kept as one module-level string so every
+# call passes sqlite3 the identical SQL text and reuses the connection's
+# cached prepared statement instead of compiling it again. The new row's
+# upload_date is set by SQLite (DEFAULT CURRENT_TIMESTAMP) and read back.
+_INSERT_DOCUMENT_SQL = '''
+    INSERT INTO documents (user_id, filename, original_filename, file_path, extracted_text, clauses,
+                           content_hash, clauses_summary, text_preview, text_length)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+''' + ('RETURNING id, upload_date' if _SUPPORTS_RETURNING else '')
+
+
+def save_document(user_id, filename, original_filename, file_path, extracted_text=None, clauses=None,
+                  content_hash=None, clauses_summary=None, text_preview=None, text_length=None):
     """
     Save a new document record to the database.
     
@@ -342,13 +803,24 @@ def save_document(user_id, filename, original_filename, file_path, extracted_tex
         original_filename (str): Original name of the uploaded file
         file_path (str): Full filesystem path where the PDF is stored
         extracted_text (str, optional): Text content extracted from the PDF
-        clauses (dict/list, optional): Identified clauses (will be JSON-serialized)
+        clauses (dict/list, optional): Identified clauses (serialized by
+            _encode_clauses)
+        content_hash (str, optional): Digest of the PDF bytes (see
+            get_analysis_by_content_hash)
+        clauses_summary (dict, optional): Clause counts per category
+            (will be JSON-serialized)
+        text_preview (str, optional): Start of the extracted text
+        text_length (int, optional): Length of the extracted text
     
     Returns:
-        int: The ID of the saved document, or None if save failed
+        tuple: (doc_id, upload_date)
+               - doc_id: The ID of the saved document
+               - upload_date: The stored upload timestamp (UTC,
+                 'YYYY-MM-DD HH:MM:SS')
+               Both are None if the save failed
     
     Example:
-        doc_id = save_document(
+        doc_id, upload_date = save_document(
             user_id=1,
             filename='abc123.pdf',
             original_filename='Contract_2024.pdf',
@@ -358,30 +830,92 @@ def save_document(user_id, filename, original_filename, file_path, extracted_tex
         )
     """
     conn = get_db_connection()
-    cursor = conn.cursor()
     
     try:
-        # Convert clauses dict/list to JSON string for storage
-        # SQLite doesn't have a native JSON type, so we store as TEXT
-        clauses_json = json.dumps(clauses) if clauses else None
+        # Convert clauses dict/list to MessagePack (or JSON) for storage
+        clauses_data = _encode_clauses(clauses)
+        summary_json = orjson.dumps(clauses_summary).decode('utf-8') if clauses_summary else None
         
-        cursor.execute('''
-            INSERT INTO documents (user_id, filename, original_filename, file_path, extracted_text, clauses)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (user_id, filename, original_filename, file_path, extracted_text, clauses_json))
+        cursor = conn.execute(_INSERT_DOCUMENT_SQL, (
+            user_id, filename, original_filename, file_path, extracted_text, clauses_data,
+            content_hash, summary_json, text_preview, text_length
+        ))
+        
+        if _SUPPORTS_RETURNING:
+            doc_id, upload_date = cursor.fetchone()
+        else:
+            doc_id = cursor.lastrowid
+            upload_date = conn.execute(
+                'SELECT upload_date FROM documents WHERE id = ?', (doc_id,)
+            ).fetchone()[0]
         
         conn.commit()
         
-        doc_id = cursor.lastrowid
-        print(f"✓ Document saved: {original_filename} (ID: {doc_id})")
-        return doc_id
+        invalidate_dashboard_cache(user_id)
+        logger.info("✓ Document saved: %s (ID: %s)", original_filename, doc_id)
+        return doc_id, upload_date
         
     except sqlite3.Error as e:
-        print(f"✗ Document save error: {e}")
+        logger.error("✗ Document save error: %s", e)
+        return None, None
+        
+    finally:
+        release_db_connection(conn)
+
+
+def get_analysis_by_content_hash(user_id, content_hash):
+    """
+    Find the stored analysis of a PDF the user uploaded before.
+    
+    Text and clause extraction depend only on the PDF bytes, so when a
+    user uploads the same file again its stored results are reused
+    instead of parsing and scanning the PDF again. Only the user's own
+    documents are searched: a match across accounts would let response
+    times reveal which files other users hold.
+    
+    Args:
+        user_id (int): ID of the uploading user
+        content_hash (str): Digest of the uploaded PDF bytes
+    
+    Returns:
+        tuple: (extracted_text, clauses) from the most recent matching
+               document
+        None: If the user has no document with this hash, its text
+              extraction had failed (so the PDF is parsed again), or on
+              database error
+    
+    Example:
+        cached = get_analysis_by_content_hash(user_id, digest)
+        if cached:
+            extracted_text, clauses = cached
+    """
+    conn = get_db_connection()
+    
+    try:
+        row = conn.execute('''
+            SELECT extracted_text, clauses FROM documents
+            WHERE user_id = ? AND content_hash = ?
+            ORDER BY id DESC
+            LIMIT 1
+        ''', (user_id, content_hash)).fetchone()
+        
+        # Failed extractions are stored as empty text - don't reuse them
+        if row is None or not row['extracted_text']:
+            return None
+        
+        try:
+            clauses = _decode_clauses(row['clauses'])
+        except ValueError:
+            return None
+        
+        return row['extracted_text'], clauses
+        
+    except sqlite3.Error as e:
+        logger.error("✗ Error looking up document analysis: %s", e)
         return None
         
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 def get_user_documents(user_id):
@@ -389,15 +923,22 @@ def get_user_documents(user_id):
     Retrieve all documents uploaded by a specific user.
     
     Returns documents in reverse chronological order (newest first).
-    The clauses field is automatically parsed from JSON back to Python dict.
+    The stored clauses and clauses_summary are parsed back to Python
+    objects. For listings that only need the clause counts, use
+    get_user_documents_summary(), which doesn't load the full clauses.
+    
+    The full extracted text is not loaded (it can be megabytes per
+    document); use get_document_by_id() to get one document's text.
     
     Args:
         user_id (int): ID of the user whose documents to retrieve
     
     Returns:
         list: List of document dictionaries, each containing:
-              - id, filename, original_filename, file_path, 
-              - extracted_text, clauses (as dict), upload_date
+              - id, user_id, filename, original_filename, file_path,
+              - clauses (as dict), clauses_summary (as dict, or None for
+                documents saved before summaries were stored), upload_date,
+              - content_hash, text_preview, text_length
               Returns empty list if no documents or error
     
     Example:
@@ -409,36 +950,115 @@ def get_user_documents(user_id):
     
     try:
         cursor = conn.execute('''
-            SELECT * FROM documents 
+            SELECT id, user_id, filename, original_filename, file_path, upload_date,
+                   clauses, content_hash, clauses_summary, text_preview, text_length
+            FROM documents 
             WHERE user_id = ? 
             ORDER BY upload_date DESC
         ''', (user_id,))
         
         rows = cursor.fetchall()
         
-        # Convert rows to list of dictionaries and parse JSON clauses
+        # Convert rows to list of dictionaries and parse the stored clauses
+        # (MessagePack or JSON) and JSON summaries
         documents = []
         for row in rows:
             doc = dict(row)
-            # Parse the clauses JSON string back to Python dict/list
             if doc['clauses']:
                 try:
-                    doc['clauses'] = json.loads(doc['clauses'])
-                except json.JSONDecodeError:
+                    doc['clauses'] = _decode_clauses(doc['clauses'])
+                except ValueError:
                     doc['clauses'] = None
+            if doc['clauses_summary']:
+                doc['clauses_summary'] = orjson.loads(doc['clauses_summary'])
             documents.append(doc)
         
         return documents
         
     except sqlite3.Error as e:
-        print(f"✗ Error fetching user documents: {e}")
+        logger.error("✗ Error fetching user documents: %s", e)
         return []
         
     finally:
-        conn.close()
+        release_db_connection(conn)
+
+
+def get_user_documents_summary(user_id):
+    """
+    Retrieve the list view of a user's documents (newest first).
+    
+    Like get_user_documents(), but only fetches the columns the document
+    list needs. The extracted text is reduced to a has_extracted_text flag
+    in SQL (from the stored text_length where available), so full
+    document texts are never returned from the database.
+    
+    Args:
+        user_id (int): ID of the user whose documents to retrieve
+    
+    Returns:
+        list: List of document dictionaries, each containing:
+              - id, filename, original_filename, upload_date
+              - has_extracted_text (bool)
+              - clauses_summary (as dict), or None for documents saved
+                before summaries were stored; those include the parsed
+                clauses instead (otherwise clauses is None)
+              Returns empty list if no documents or error
+    
+    Example:
+        for doc in get_user_documents_summary(1):
+            print(doc['original_filename'], doc['clauses_summary'])
+    """
+    conn = get_db_connection()
+    
+    try:
+        cursor = conn.execute('''
+            SELECT id, filename, original_filename, upload_date, clauses_summary,
+                   CASE WHEN text_length IS NOT NULL THEN text_length > 0
+                        ELSE extracted_text IS NOT NULL AND extracted_text != ''
+                   END AS has_extracted_text,
+                   CASE WHEN clauses_summary IS NULL THEN clauses END AS clauses
+            FROM documents
+            WHERE user_id = ?
+            ORDER BY upload_date DESC
+        ''', (user_id,))
+        
+        documents = []
+        for row in cursor.fetchall():
+            doc = dict(row)
+            doc['has_extracted_text'] = bool(doc['has_extracted_text'])
+            if doc['clauses_summary']:
+                doc['clauses_summary'] = orjson.loads(doc['clauses_summary'])
+            elif doc['clauses']:
+                try:
+                    doc['clauses'] = _decode_clauses(doc['clauses'])
+                except ValueError:
+                    doc['clauses'] = None
+            documents.append(doc)
+        
+        return documents
+        
+    except sqlite3.Error as e:
+        logger.error("✗ Error fetching user documents: %s", e)
+        return []
+        
+    finally:
+        release_db_connection(conn)
+
 
+# Columns loaded by get_document_by_id(include_text=False). Documents saved
+# before text_preview/text_length existed get them computed in SQL, so the
+# full text still never leaves the database.
+_DOCUMENT_COLUMNS_WITHOUT_TEXT = """
+    id, user_id, filename, original_filename, file_path, upload_date, clauses,
+    content_hash, clauses_summary,
+    COALESCE(text_preview,
+             substr(extracted_text, 1, 500)
+             || CASE WHEN length(extracted_text) > 500 THEN '...' ELSE '' END) AS text_preview,
+    COALESCE(text_length, length(extracted_text)) AS text_length
+"""
 
-def get_document_by_id(document_id, user_id=None):
+
+def get_document_by_id(document_id, user_id=None, include_text=True):
     """
     Retrieve a single document by its ID.
     
@@ -448,6 +1068,8 @@ def get_document_by_id(document_id, user_id=None):
     Args:
         document_id (int): The ID of the document to retrieve
         user_id (int, optional): If provided, verify document ownership
+        include_text (bool): Load extracted_text. When False the document
+            has no 'extracted_text' key, only text_preview and text_length.
     
     Returns:
         dict: Document data, or None if not found (or not owned by user)
@@ -459,16 +1081,18 @@ def get_document_by_id(document_id, user_id=None):
     """
     conn = get_db_connection()
     
+    columns = '*' if include_text else _DOCUMENT_COLUMNS_WITHOUT_TEXT
+    
     try:
         if user_id:
             # Security check: only return if user owns the document
             cursor = conn.execute(
-                'SELECT * FROM documents WHERE id = ? AND user_id = ?',
+                f'SELECT {columns} FROM documents WHERE id = ? AND user_id = ?',
                 (document_id, user_id)
             )
         else:
             cursor = conn.execute(
-                'SELECT * FROM documents WHERE id = ?',
+                f'SELECT {columns} FROM documents WHERE id = ?',
                 (document_id,)
             )
         
@@ -476,21 +1100,31 @@ def get_document_by_id(document_id, user_id=None):
         
         if row:
             doc = dict(row)
-            # Parse clauses JSON
+            if include_text and doc['text_length'] is None and doc['extracted_text'] is not None:
+                # Saved before the preview columns existed
+                text = doc['extracted_text']
+                doc['text_preview'] = text[:500] + "..." if len(text) > 500 else text
+                doc['text_length'] = len(text)
+            if doc['clauses_summary']:
+                try:
+                    doc['clauses_summary'] = orjson.loads(doc['clauses_summary'])
+                except orjson.JSONDecodeError:
+                    doc['clauses_summary'] = None
+            # Parse the stored clauses
             if doc['clauses']:
                 try:
-                    doc['clauses'] = json.loads(doc['clauses'])
-                except json.JSONDecodeError:
+                    doc['clauses'] = _decode_clauses(doc['clauses'])
+                except ValueError:
                     doc['clauses'] = None
             return doc
         return None
         
     except sqlite3.Error as e:
-        print(f"✗ Error fetching document: {e}")
+        logger.error("✗ Error fetching document: %s", e)
         return None
         
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 def delete_document(document_id, user_id):
@@ -519,18 +1153,8 @@ def delete_document(document_id, user_id):
     conn = get_db_connection()
     
     try:
-        # First, get the document to verify ownership and get file path
-        cursor = conn.execute(
-            'SELECT file_path FROM documents WHERE id = ? AND user_id = ?',
-            (document_id, user_id)
-        )
-        doc = cursor.fetchone()
-        
-        if not doc:
-            print(f"✗ Document not found or not owned by user")
-            return False
-        
-        # Delete the database record
+        # The ownership check is part of the DELETE itself - no separate
+        # SELECT first
         cursor = conn.execute(
             'DELETE FROM documents WHERE id = ? AND user_id = ?',
             (document_id, user_id)
@@ -539,17 +1163,107 @@ def delete_document(document_id, user_id):
         conn.commit()
         
         # rowcount tells us how many rows were affected
+        # (0 means the document doesn't exist or isn't owned by the user)
         if cursor.rowcount > 0:
-            print(f"✓ Document deleted (ID: {document_id})")
+            invalidate_dashboard_cache(user_id)
+            logger.info("✓ Document deleted (ID: %s)", document_id)
             return True
+        
+        logger.info("✗ Document not found or not owned by user")
         return False
         
     except sqlite3.Error as e:
-        print(f"✗ Document deletion error: {e}")
+        logger.error("✗ Document deletion error: %s", e)
         return False
         
     finally:
-        conn.close()
+        release_db_connection(conn)
+
+
+def delete_document_returning_path(document_id, user_id):
+    """
+    Delete a user's document and return its file path, in one statement.
+    
+    The ownership check is part of the DELETE itself, so there is no
+    separate lookup before deleting (and no window between the check and
+    the delete).
+    
+    Args:
+        document_id (int): ID of the document to delete
+        user_id (int): ID of the user requesting deletion (must own it)
+    
+    Returns:
+        str: The deleted document's file path (the PDF file itself is
+             not removed - that is up to the caller)
+        None: If the document doesn't exist, isn't owned by the user,
+              or on database error (see get_document_owner to tell apart)
+    
+    Example:
+        file_path = delete_document_returning_path(5, user_id=1)
+        if file_path:
+            os.remove(file_path)
+    """
+    conn = get_db_connection()
+    
+    try:
+        if _SUPPORTS_RETURNING:
+            row = conn.execute(
+                'DELETE FROM documents WHERE id = ? AND user_id = ? RETURNING file_path',
+                (document_id, user_id)
+            ).fetchone()
+        else:
+            row = conn.execute(
+                'SELECT file_path FROM documents WHERE id = ? AND user_id = ?',
+                (document_id, user_id)
+            ).fetchone()
+            if row:
+                conn.execute('DELETE FROM documents WHERE id = ?', (document_id,))
+        
+        conn.commit()
+        
+        if row is None:
+            return None
+        
+        invalidate_dashboard_cache(user_id)
+        logger.info("✓ Document deleted (ID: %s)", document_id)
+        return row['file_path']
+        
+    except sqlite3.Error as e:
+        logger.error("✗ Document deletion error: %s", e)
+        return None
+        
+    finally:
+        release_db_connection(conn)
+
+
+def get_document_owner(document_id):
+    """
+    Get the ID of the user who owns a document.
+    
+    A cheap lookup used to explain why a delete didn't happen
+    (document missing vs. owned by someone else).
+    
+    Args:
+        document_id (int): ID of the document
+    
+    Returns:
+        int: The owner's user ID, or None if the document doesn't exist
+    """
+    conn = get_db_connection()
+    
+    try:
+        row = conn.execute(
+            'SELECT user_id FROM documents WHERE id = ?',
+            (document_id,)
+        ).fetchone()
+        return row['user_id'] if row else None
+        
+    except sqlite3.Error as e:
+        logger.error("✗ Error fetching document owner: %s", e)
+        return None
+        
+    finally:
+        release_db_connection(conn)
 
 
 # =============================================================================
@@ -577,56 +1291,136 @@ def get_dashboard_stats(user_id):
         stats = get_dashboard_stats(1)
         print(f"You have {stats['total_documents']} documents")
     """
+    try:
+        return _query_dashboard_stats(user_id)
+    except sqlite3.Error as e:
+        logger.error("✗ Error fetching dashboard stats: %s", e)
+        return _empty_dashboard_stats()
+
+
+def _query_dashboard_stats(user_id):
+    """
+    Run the dashboard queries for get_dashboard_stats().
+    
+    Unlike get_dashboard_stats(), database errors are raised rather than
+    turned into empty stats, so callers can tell the two apart.
+    
+    Args:
+        user_id (int): ID of the user
+    
+    Returns:
+        dict: Dashboard statistics (see get_dashboard_stats)
+    
+    Raises:
+        sqlite3.Error: If a query fails
+    """
     conn = get_db_connection()
     
     try:
         stats = {}
         
-        # Count total documents
-        cursor = conn.execute(
-            'SELECT COUNT(*) as count FROM documents WHERE user_id = ?',
-            (user_id,)
-        )
-        stats['total_documents'] = cursor.fetchone()['count']
-        
-        # Count documents with extracted clauses
-        cursor = conn.execute(
-            'SELECT COUNT(*) as count FROM documents WHERE user_id = ? AND clauses IS NOT NULL',
-            (user_id,)
-        )
-        stats['total_clauses_extracted'] = cursor.fetchone()['count']
+        # Get the document counts and the account creation date in one
+        # query. The counts are kept in user_document_stats by triggers, so
+        # this reads a single row however many documents the user has.
+        # Users without documents have no stats row (counts are 0), and
+        # account_created is NULL if the user doesn't exist.
+        row = conn.execute('''
+            SELECT COALESCE((SELECT total_documents FROM user_document_stats
+                             WHERE user_id = ?), 0) AS total_documents,
+                   COALESCE((SELECT documents_with_clauses FROM user_document_stats
+                             WHERE user_id = ?), 0) AS total_clauses_extracted,
+                   (SELECT created_at FROM users WHERE id = ?) AS account_created
+        ''', (user_id, user_id, user_id)).fetchone()
+        stats['total_documents'] = row['total_documents']
+        stats['total_clauses_extracted'] = row['total_clauses_extracted']
         
         # Get 5 most recent documents (just basic info, not full text)
-        cursor = conn.execute('''
-            SELECT id, original_filename, upload_date 
-            FROM documents 
-            WHERE user_id = ? 
-            ORDER BY upload_date DESC 
-            LIMIT 5
-        ''', (user_id,))
-        stats['recent_documents'] = [dict(row) for row in cursor.fetchall()]
+        # A user without documents (e.g. a new account) has none - no need
+        # to query for them
+        if stats['total_documents']:
+            cursor = conn.execute('''
+                SELECT id, original_filename, upload_date 
+                FROM documents 
+                WHERE user_id = ? 
+                ORDER BY upload_date DESC 
+                LIMIT 5
+            ''', (user_id,))
+            stats['recent_documents'] = [dict(row) for row in cursor.fetchall()]
+        else:
+            stats['recent_documents'] = []
         
-        # Get user account creation date
-        cursor = conn.execute(
-            'SELECT created_at FROM users WHERE id = ?',
-            (user_id,)
-        )
-        user_row = cursor.fetchone()
-        stats['account_created'] = user_row['created_at'] if user_row else None
+        stats['account_created'] = row['account_created']
         
         return stats
         
-    except sqlite3.Error as e:
-        print(f"✗ Error fetching dashboard stats: {e}")
-        return {
-            'total_documents': 0,
-            'recent_documents': [],
-            'total_clauses_extracted': 0,
-            'account_created': None
-        }
-        
     finally:
-        conn.close()
+        release_db_connection(conn)
+
+
+def _empty_dashboard_stats():
+    """Dashboard statistics returned when they can't be read from the database."""
+    return {
+        'total_documents': 0,
+        'recent_documents': [],
+        'total_clauses_extracted': 0,
+        'account_created': None
+    }
+
+
+# Dashboards are polled often and can be a few seconds stale, so each user's
+# stats are kept for a short time. The cache lives in each server process:
+# saving or deleting a document drops the user's entry only in the process
+# that handled the change. With several gunicorn workers, the others can
+# show the old stats until their entry expires (at most DASHBOARD_CACHE_TTL
+# seconds).
+# - DASHBOARD_CACHE_TTL: Seconds cached stats stay valid
+# - DASHBOARD_CACHE_MAXSIZE: Maximum number of users whose stats are kept
+DASHBOARD_CACHE_TTL = 30
+DASHBOARD_CACHE_MAXSIZE = 4096
+
+_dashboard_cache = TTLCache(maxsize=DASHBOARD_CACHE_MAXSIZE, ttl=DASHBOARD_CACHE_TTL)
+
+
+def get_cached_dashboard_stats(user_id):
+    """
+    Get a user's dashboard statistics, served from an in-memory TTL cache.
+    
+    On a cache miss the stats are read from the database and kept for
+    DASHBOARD_CACHE_TTL seconds in this process (other server processes
+    have their own cache). If the database can't be read, empty stats are
+    returned and nothing is cached, so the next request tries again.
+    
+    Args:
+        user_id (int): ID of the user
+    
+    Returns:
+        dict: A copy of the dashboard statistics (see get_dashboard_stats).
+              The nested recent_documents list is shared - don't modify it.
+    """
+    stats = _dashboard_cache.get(user_id)
+    
+    if stats is None:
+        try:
+            stats = _query_dashboard_stats(user_id)
+        except sqlite3.Error as e:
+            logger.error("✗ Error fetching dashboard stats: %s", e)
+            return _empty_dashboard_stats()
+        _dashboard_cache.set(user_id, stats)
+    
+    return dict(stats)
+
+
+def invalidate_dashboard_cache(user_id):
+    """
+    Drop a user's cached dashboard statistics in this process.
+    
+    Called whenever one of the user's documents is saved or deleted.
+    Other server processes keep their cached copy until it expires.
+    
+    Args:
+        user_id (int): ID of the user
+    """
+    _dashboard_cache.pop(user_id)
 
 
 # =============================================================================
@@ -650,33 +1444,78 @@ def user_exists(username=None, email=None):
         if user_exists(username='john_doe'):
             print("Username already taken!")
     """
+    # Empty values are not checked (same as not passing them)
+    username = username or None
+    email = email or None
+    if username is None and email is None:
+        return False
+    
     conn = get_db_connection()
     
     try:
-        if username:
-            cursor = conn.execute(
-                'SELECT 1 FROM users WHERE username = ?',
-                (username,)
-            )
-            if cursor.fetchone():
-                return True
-        
-        if email:
-            cursor = conn.execute(
-                'SELECT 1 FROM users WHERE email = ?',
-                (email,)
-            )
-            if cursor.fetchone():
-                return True
+        # One query for both columns - each branch is a lookup on the
+        # index behind its UNIQUE constraint
+        cursor = conn.execute(
+            '''SELECT 1 FROM users
+               WHERE (? IS NOT NULL AND username = ?)
+                  OR (? IS NOT NULL AND email = ?)
+               LIMIT 1''',
+            (username, username, email, email)
+        )
+        return cursor.fetchone() is not None
         
+    except sqlite3.Error as e:
+        logger.error("✗ Error checking user existence: %s", e)
         return False
         
+    finally:
+        release_db_connection(conn)
+
+
+def check_user_conflicts(username, email):
+    """
+    Check in one query whether a username and/or email is already taken.
+    
+    Used during registration instead of two separate user_exists() calls.
+    At most two rows can match (one per UNIQUE column).
+    
+    Args:
+        username (str): Username to check
+        email (str): Email to check
+    
+    Returns:
+        tuple: (username_taken, email_taken) as booleans
+               Returns (False, False) on database error
+    
+    Example:
+        username_taken, email_taken = check_user_conflicts('john_doe', 'john@example.com')
+        if username_taken:
+            print("Username already taken!")
+    """
+    conn = get_db_connection()
+    
+    try:
+        cursor = conn.execute(
+            'SELECT username, email FROM users WHERE username = ? OR email = ?',
+            (username, email)
+        )
+        
+        username_taken = False
+        email_taken = False
+        for row in cursor.fetchall():
+            if row['username'] == username:
+                username_taken = True
+            if row['email'] == email:
+                email_taken = True
+        
+        return username_taken, email_taken
+        
     except sqlite3.Error as e:
-        print(f"✗ Error checking user existence: {e}")
-        return False
+        logger.error("✗ Error checking user conflicts: %s", e)
+        return False, False
         
     finally:
-        conn.close()
+        release_db_connection(conn)
 
 
 # =============================================================================
@@ -685,6 +1524,9 @@ def user_exists(username=None, email=None):
 
 # When this module is run directly (not imported), initialize the database
 if __name__ == '__main__':
+    # Show this module's log messages on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     print("Initializing ContractIQ Database...")
     print("=" * 50)
     init_db()
@@ -0,0 +1,101 @@
+# Document analysis pipeline
+# This module runs the CPU-heavy part of an upload: PDF text extraction
+# followed by clause extraction. It can run in the request's own process
+# or in a pool of worker processes, so concurrent uploads use all CPU cores.
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_processor import extract_text_from_pdf
+from clause_extractor import extract_clauses
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Number of worker processes for document analysis
+# - 0 (default): Analyze in the request's own process
+# - N > 0: Analyze in a pool of N processes. PDF parsing and keyword
+#   matching hold the GIL, so within one server process concurrent uploads
+#   otherwise take turns on a single core.
+PDF_PROCESS_WORKERS = int(os.environ.get('PDF_PROCESS_WORKERS', 0))
+
+# Worker pool, created on first use in each server process
+_pool = None
+_pool_pid = None
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+def analyze_pdf(pdf_path):
+    """
+    Extract the text of a PDF and the contract clauses in it.
+
+    Runs in whichever process does the analysis, so it only takes and
+    returns picklable values.
+
+    Args:
+        pdf_path (str): Path to the saved PDF file
+
+    Returns:
+        tuple: (extracted_text, clauses)
+               - extracted_text: Cleaned text, or None if extraction failed
+               - clauses: Output of extract_clauses(), or None if there
+                 was no text to analyze
+    """
+    extracted_text = extract_text_from_pdf(pdf_path)
+
+    if not extracted_text:
+        return extracted_text, None
+
+    return extracted_text, extract_clauses(extracted_text)
+
+
+def _get_pool():
+    """
+    Get this process's analysis pool, creating it on first use.
+
+    The pool is created lazily (and again after a fork) so a gunicorn
+    master never shares its worker processes with the server workers.
+    Workers are started with 'spawn': forking a threaded server process
+    could copy locks held by other threads.
+
+    Returns:
+        ProcessPoolExecutor: The pool for this process
+    """
+    global _pool, _pool_pid
+
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = ProcessPoolExecutor(
+            max_workers=PDF_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        _pool_pid = os.getpid()
+
+    return _pool
+
+
+def analyze_document(pdf_path):
+    """
+    Analyze a PDF, using the worker pool if one is configured.
+
+    Only the path crosses to a worker process, which reads the file itself.
+
+    Args:
+        pdf_path (str): Path to the saved PDF file
+
+    Returns:
+        tuple: (extracted_text, clauses) - see analyze_pdf()
+
+    Example:
+        text, clauses = analyze_document('/path/to/contract.pdf')
+        if text is None:
+            print("Could not extract text")
+    """
+    if PDF_PROCESS_WORKERS <= 0:
+        return analyze_pdf(pdf_path)
+
+    return _get_pool().submit(analyze_pdf, pdf_path).result()
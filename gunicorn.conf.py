@@ -0,0 +1,42 @@
+# Gunicorn configuration for ContractIQ
+# Loaded automatically when running: gunicorn wsgi:app
+# Every setting can be overridden with an environment variable or CLI flag
+
+import multiprocessing
+import os
+
+# =============================================================================
+# SERVER SOCKET
+# =============================================================================
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# =============================================================================
+# WORKER PROCESSES
+# =============================================================================
+
+# One worker process per CPU core. Each worker keeps its own database
+# connection pool and in-memory caches, so more processes than cores only
+# adds memory and cache misses; concurrency within a worker comes from its
+# threads (below).
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+
+# Worker class:
+# - 'gthread' (default): Thread pool per worker. SQLite queries, PDF parsing
+#   (PyMuPDF/PyPDF2), password hashing and clause matching all block the
+#   calling thread, and threads let the other requests in that worker keep
+#   running while one of them does.
+# - 'gevent': Cooperative workers. These calls never yield to other
+#   greenlets, so one upload stalls every request in its worker. Only use
+#   gevent for deployments whose traffic is almost entirely I/O-bound.
+#   Example: GUNICORN_WORKER_CLASS=gevent gunicorn wsgi:app
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+# Threads per worker (only used by the gthread worker class)
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Maximum simultaneous clients per gevent worker
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Large PDF uploads can take a while to extract
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
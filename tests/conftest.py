@@ -0,0 +1,31 @@
+# Shared pytest fixtures for the ContractIQ backend tests
+# The application modules live in the repository root, next to this folder
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """
+    The database module, pointed at a new, initialized database file.
+
+    The connection pool and the in-memory caches are reset so nothing
+    carries over from another test's database.
+    """
+    monkeypatch.setattr(database, 'DATABASE_PATH', str(tmp_path / 'instance' / 'contractiq.db'))
+    monkeypatch.setattr(database, '_pool_pid', None)
+    database.invalidate_user_cache()
+    database._dashboard_cache.clear()
+
+    assert database.init_db()
+    yield database
+
+    database.invalidate_user_cache()
+    database._dashboard_cache.clear()
@@ -0,0 +1,23 @@
+# Tests for app.py
+
+from decimal import Decimal
+
+from flask.json.tag import TaggedJSONSerializer
+from markupsafe import Markup
+
+from app import app
+
+
+def test_json_provider_converts_types_orjson_does_not_know():
+    with app.app_context():
+        assert app.json.dumps({'amount': Decimal('1.5')}) == '{"amount":"1.5"}'
+        assert app.json.response({'amount': Decimal('1.5')}).get_data() == b'{"amount":"1.5"}'
+
+
+def test_session_values_survive_the_json_provider():
+    # The signed-cookie session encodes tagged values through app.json
+    value = {'_flashes': [('message', 'Saved')], 'token': b'\x00\x01', 'note': Markup('<b>hi</b>')}
+
+    with app.app_context():
+        serializer = TaggedJSONSerializer()
+        assert serializer.loads(serializer.dumps(value)) == value
@@ -0,0 +1,51 @@
+# Tests for cache.py
+
+import time
+
+from cache import TTLCache
+
+
+def test_get_set_pop_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get('a') is None
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    assert len(cache) == 2
+
+    cache.pop('a')
+    cache.pop('missing')
+    assert cache.get('a') is None
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set('default', 1)
+    cache.set('short', 2, ttl=5)
+
+    now[0] += 10
+    assert cache.get('short') is None
+    assert cache.get('default') == 1
+
+    now[0] += 60
+    assert cache.get('default') is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')  # 'b' is now the least recently used
+
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
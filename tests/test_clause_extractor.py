@@ -0,0 +1,113 @@
+# Tests for clause_extractor.py
+
+import importlib
+import sys
+
+import pytest
+
+import clause_extractor
+
+
+# Sentences covering the short keywords ("fee", "pay", "nda"), keywords that
+# are prefixes of longer ones ("pay" / "payment"), multi-word keywords and
+# keywords at the very start or end of a sentence
+CORPUS = [
+    'The Client shall pay the agreed fee within 30 days.',
+    'Fee schedules are attached as Exhibit B.',
+    'This agreement is subject to the NDA signed by both parties.',
+    'Late payment will incur interest.',
+    'Either party may terminate this agreement with notice.',
+    'The weather was pleasant.',
+    'Nothing here is payable in advance, see the payload spec and the agenda.',
+    'Invoices are due on receipt; no fee',
+    'pay',
+    'nda',
+]
+
+# Backends that can be selected: the Hyperscan database, the Aho-Corasick
+# automaton, or the trie regex when neither is importable
+BACKENDS = {
+    'hyperscan': [],
+    'ahocorasick': ['hyperscan'],
+    'regex': ['hyperscan', 'ahocorasick'],
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def extractor(request, monkeypatch):
+    """
+    A freshly imported clause_extractor using the given matcher backend.
+
+    Backends ranked above it are hidden (a None entry in sys.modules makes
+    the import raise ImportError); the test is skipped if the backend
+    itself isn't installed.
+    """
+    if request.param != 'regex':
+        pytest.importorskip(request.param)
+
+    for module_name in BACKENDS[request.param]:
+        monkeypatch.setitem(sys.modules, module_name, None)
+
+    monkeypatch.delitem(sys.modules, 'clause_extractor')
+    module = importlib.import_module('clause_extractor')
+    # monkeypatch restores the original module (and hides nothing) afterwards
+    monkeypatch.setitem(sys.modules, 'clause_extractor', clause_extractor)
+    return module
+
+
+def _categories(module, sentences):
+    return module.find_sentence_categories([module.normalize_text(s) for s in sentences])
+
+
+def test_backends_find_identical_categories(extractor):
+    reference = _categories(clause_extractor, CORPUS)
+
+    assert _categories(extractor, CORPUS) == reference
+    assert extractor.extract_clauses(' '.join(CORPUS)) == clause_extractor.extract_clauses(' '.join(CORPUS))
+
+
+def test_short_keywords_are_matched(extractor):
+    categories = _categories(extractor, CORPUS)
+
+    assert 'Payment' in categories[0]
+    assert 'Payment' in categories[1]
+    assert 'Confidentiality' in categories[2]
+    assert 'Payment' in categories[3]
+    assert categories[5] == set()
+    # Keywords at the end or making up the whole sentence
+    assert 'Payment' in categories[7]
+    assert categories[8] == {'Payment'}
+    assert categories[9] == {'Confidentiality'}
+
+
+def test_keywords_are_matched_as_substrings(extractor):
+    # "pay" matches inside "payable"/"payload" and "nda" inside "agenda"
+    categories = _categories(extractor, ['See the payload spec.', 'Read the agenda.'])
+
+    assert categories == [{'Payment'}, {'Confidentiality'}]
+
+
+def test_keywords_do_not_span_sentences(extractor):
+    # "...of" + "ee..." and "...n" + "da..." only form a keyword across the
+    # boundary between two sentences
+    categories = _categories(extractor, ['Chapter one of', 'ee cummings', 'Plan', 'da capo'])
+
+    assert categories == [set(), set(), set(), set()]
+
+
+def test_abbreviations_do_not_split_sentences():
+    text = 'Acme Inc. shall pay the fee. Costs, e.g. travel, are excluded. Dr. Smith signed it.'
+
+    assert clause_extractor.split_into_sentences(text) == [
+        'Acme Inc. shall pay the fee.',
+        'Costs, e.g. travel, are excluded.',
+        'Dr. Smith signed it.',
+    ]
+    assert list(clause_extractor.iter_sentences(text)) == clause_extractor.split_into_sentences(text)
+
+
+def test_available_categories_cannot_be_corrupted_by_callers():
+    categories = clause_extractor.get_available_categories()
+    categories.clear()
+
+    assert clause_extractor.get_available_categories() == list(clause_extractor.CLAUSE_KEYWORDS)
@@ -0,0 +1,119 @@
+# Tests for database.py
+
+import sqlite3
+
+
+def test_init_db_enables_wal(db):
+    conn = sqlite3.connect(db.DATABASE_PATH)
+    try:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == db.SCHEMA_VERSION
+    finally:
+        conn.close()
+
+
+def test_init_db_backfills_stats_when_upgrading(db):
+    user_id = db.create_user('alice', 'alice@example.com', 'hash')
+    db.save_document(user_id, 'a.pdf', 'a.pdf', '/tmp/a.pdf', 'text', {'Payment': ['Pay.']})
+    db.save_document(user_id, 'b.pdf', 'b.pdf', '/tmp/b.pdf', 'text', None)
+
+    # Turn the file back into a version 3 database (no stats table yet)
+    conn = sqlite3.connect(db.DATABASE_PATH)
+    conn.executescript('''
+        DROP TRIGGER trg_documents_stats_insert;
+        DROP TRIGGER trg_documents_stats_delete;
+        DROP TRIGGER trg_documents_stats_update;
+        DROP TABLE user_document_stats;
+        PRAGMA user_version = 3;
+    ''')
+    conn.close()
+
+    assert db.init_db()
+    stats = db.get_dashboard_stats(user_id)
+    assert stats['total_documents'] == 2
+    assert stats['total_clauses_extracted'] == 1
+
+
+def test_dashboard_errors_are_not_cached(db, monkeypatch):
+    user_id = db.create_user('bob', 'bob@example.com', 'hash')
+    db.save_document(user_id, 'a.pdf', 'a.pdf', '/tmp/a.pdf', 'text', None)
+
+    query_dashboard_stats = db._query_dashboard_stats
+
+    def failing_query(user_id):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(db, '_query_dashboard_stats', failing_query)
+    assert db.get_cached_dashboard_stats(user_id)['total_documents'] == 0
+
+    # The failure wasn't cached: once the database answers, real stats are returned
+    monkeypatch.setattr(db, '_query_dashboard_stats', query_dashboard_stats)
+    assert db.get_cached_dashboard_stats(user_id)['total_documents'] == 1
+
+
+def test_get_user_documents_decodes_clauses(db):
+    user_id = db.create_user('carol', 'carol@example.com', 'hash')
+    clauses = {'Payment': ['The Client shall pay the fee.']}
+    db.save_document(user_id, 'a.pdf', 'a.pdf', '/tmp/a.pdf', 'text', clauses,
+                     clauses_summary={'total_clauses': 1})
+
+    [doc] = db.get_user_documents(user_id)
+    assert doc['clauses'] == clauses
+    assert doc['clauses_summary'] == {'total_clauses': 1}
+
+
+def _stats_row(db, user_id):
+    conn = sqlite3.connect(db.DATABASE_PATH)
+    try:
+        return conn.execute(
+            'SELECT total_documents, documents_with_clauses FROM user_document_stats WHERE user_id = ?',
+            (user_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def test_stats_triggers_track_documents(db):
+    alice = db.create_user('dave', 'dave@example.com', 'hash')
+    bob = db.create_user('erin', 'erin@example.com', 'hash')
+    doc_with_clauses, _ = db.save_document(alice, 'a.pdf', 'a.pdf', '/tmp/a.pdf', 'text', {'Payment': ['Pay.']})
+    doc_without, _ = db.save_document(alice, 'b.pdf', 'b.pdf', '/tmp/b.pdf', 'text', None)
+    assert _stats_row(db, alice) == (2, 1)
+
+    conn = sqlite3.connect(db.DATABASE_PATH)
+    conn.execute('PRAGMA foreign_keys = ON')
+    with conn:
+        # Clauses added later, and a document moved to another user
+        conn.execute("UPDATE documents SET clauses = '{}' WHERE id = ?", (doc_without,))
+        conn.execute('UPDATE documents SET user_id = ? WHERE id = ?', (bob, doc_with_clauses))
+    conn.close()
+    assert _stats_row(db, alice) == (1, 1)
+    assert _stats_row(db, bob) == (1, 1)
+
+    assert db.delete_document(doc_without, alice)
+    assert _stats_row(db, alice) == (0, 0)
+
+    # Deleting a user cascades to their documents and their stats row
+    conn = sqlite3.connect(db.DATABASE_PATH)
+    conn.execute('PRAGMA foreign_keys = ON')
+    with conn:
+        conn.execute('DELETE FROM users WHERE id = ?', (bob,))
+    conn.close()
+    assert _stats_row(db, bob) is None
+
+
+def test_analysis_is_only_reused_for_the_same_user(db):
+    owner = db.create_user('frank', 'frank@example.com', 'hash')
+    other = db.create_user('grace', 'grace@example.com', 'hash')
+    clauses = {'Payment': ['The Client shall pay the fee.']}
+    db.save_document(owner, 'a.pdf', 'a.pdf', '/tmp/a.pdf', 'text', clauses, content_hash='abc')
+
+    assert db.get_analysis_by_content_hash(owner, 'abc') == ('text', clauses)
+    assert db.get_analysis_by_content_hash(other, 'abc') is None
+
+
+def test_failed_extraction_is_not_reused(db):
+    user_id = db.create_user('heidi', 'heidi@example.com', 'hash')
+    db.save_document(user_id, 'a.pdf', 'a.pdf', '/tmp/a.pdf', '', None, content_hash='abc')
+
+    assert db.get_analysis_by_content_hash(user_id, 'abc') is None
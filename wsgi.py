@@ -0,0 +1,15 @@
+# WSGI entry point
+# Production servers (gunicorn, uWSGI) import the Flask app from this module
+# The development server in app.py (python app.py) is single-process and
+# should only be used locally
+#
+# Run with gunicorn (settings are read from gunicorn.conf.py):
+#     gunicorn wsgi:app
+
+from app import create_app
+
+# Create directories and database tables once per worker process
+app = create_app()
+
+if __name__ == '__main__':
+    app.run()